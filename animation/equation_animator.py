@@ -8,6 +8,8 @@ from manim import (
     MoveToTarget,
     config
 )
+from tex_precompile import precompile_equations
+from layout import stack_positions, Glide
 
 # ----------------------------------------------------------------------------
 # Configuration overrides (you can also supply these on the CLI if you prefer)
@@ -18,129 +20,126 @@ config.frame_rate = 30
 config.background_color = "#FFFFFF"  # White background
 
 class EquationsScene(Scene):
-    def construct(self):
-        # --------------------------------------------------------------------
-        # 1. Define parameters
-        # --------------------------------------------------------------------
-        equations_file = "equations.txt"  # Input file with one LaTeX equation per line
-        display_time   = 1.0             # Seconds to hold each equation set
-        fade_duration  = 1.0             # Seconds for fade/slide animations
-        max_visible    = 5               # Max number of equations displayed at once
-        vertical_gap   = 1.0             # Spacing between equations
+    # ------------------------------------------------------------------------
+    # 1. Define parameters
+    # ------------------------------------------------------------------------
+    equations_file = "equations.txt"  # Input file with one LaTeX equation per line
+    display_time   = 1.0             # Seconds to hold each equation set
+    fade_duration  = 1.0             # Seconds for fade/slide animations
+    max_visible    = 5               # Max number of equations displayed at once
+    vertical_gap   = 1.0             # Spacing between equations
+    compile_workers = None           # LaTeX processes for the pre-compile step (None = all cores)
+    screen_height  = 6.0             # Height the visible equations are spread over (a bit less than the frame)
+    equal_gaps     = False           # True: equal space between equations instead of evenly spaced centers
 
+    # Only animate equations [chunk_start, chunk_end) of the file; render_chunks.py
+    # renders a long file as several such scenes in parallel and joins the videos
+    chunk_start    = 0
+    chunk_end      = None            # None = to the end of the file, then fade everything out
+
+    def construct(self):
         # --------------------------------------------------------------------
         # 2. Read equations from file
         # --------------------------------------------------------------------
-        with open(equations_file, "r", encoding="utf-8") as f:
-            lines = [line.strip() for line in f if line.strip()]
+        lines = read_equations(self.equations_file)
+        chunk_end = len(lines) if self.chunk_end is None else min(self.chunk_end, len(lines))
+        # Equations still on screen when this chunk starts (none for the first chunk)
+        carried_over = lines[max(0, self.chunk_start - self.max_visible):self.chunk_start]
+
+        # Compile all distinct equations up front, in parallel; the MathTex calls
+        # in the main loop then just load the cached SVGs
+        precompile_equations(carried_over + lines[self.chunk_start:chunk_end], workers=self.compile_workers)
 
         # --------------------------------------------------------------------
         # 3. Setup data structures
         # --------------------------------------------------------------------
         displayed_equations = VGroup()  # will hold the currently visible equations
+        displayed_heights = []          # their heights, measured once when each is created
 
         # --------------------------------------------------------------------
-        # 4. Helper: position visible equations
-        #    We'll call this after we modify the displayed_equations group
-        #    so they stack nicely in the vertical center
+        # 4. Helper: target positions of the visible equations
+        #    Computed from the count (and heights) alone, see layout.py,
+        #    so nothing needs to be copied and positioned to find them
         # --------------------------------------------------------------------
-        def position_equations(equations_group):
-            """
-            Positions equations to evenly divide the vertical space.
-            As more equations are added, they spread out until reaching max_visible.
-            """
-            num_equations = len(equations_group)
-            # Height of the visible area (slightly less than full height to leave margins)
-            screen_height = 6.0
-            
-            if num_equations == 1:
-                # First equation goes in the middle
-                equations_group[0].move_to([0, 0, 0])
-            else:
-                # Multiple equations divide the screen evenly
-                spacing = screen_height / (num_equations + 1)
-                top_position = screen_height/2 - spacing
-                
-                for i, eq in enumerate(equations_group):
-                    y_pos = top_position - (i * spacing)
-                    eq.move_to([0, y_pos, 0])
+        def final_positions():
+            return stack_positions(displayed_heights, screen_height=self.screen_height, equal_gaps=self.equal_gaps)
+
+        # Carried-over equations start out where the previous chunk left them
+        for eq_text in carried_over:
+            eq_mobj = MathTex(eq_text, color="#000000")
+            displayed_equations.add(eq_mobj)
+            displayed_heights.append(eq_mobj.height)
+        for eq, position in zip(displayed_equations, final_positions()):
+            eq.move_to(position)
+        if carried_over:
+            self.add(*displayed_equations)
 
         # --------------------------------------------------------------------
         # 5. Main loop: add each equation in turn, animate
         # --------------------------------------------------------------------
-        for eq_text in lines:
+        for eq_text in lines[self.chunk_start:chunk_end]:
             # Create the equation mobject
             eq_mobj = MathTex(eq_text, color="#000000")  # black text
             eq_mobj.scale(1.0)  # adjust scale as needed
 
-            if len(displayed_equations) < max_visible:
+            if len(displayed_equations) < self.max_visible:
                 # First add the equation to our group
                 displayed_equations.add(eq_mobj)
-                
-                # Calculate final positions for ALL equations
-                final_positions = []
-                temp_group = displayed_equations.copy()
-                position_equations(temp_group)
-                for eq in temp_group:
-                    final_positions.append(eq.get_center())
-                
+                displayed_heights.append(eq_mobj.height)
+
                 # Position new equation below the screen
-                eq_mobj.move_to([0, -vertical_gap * (max_visible), 0])
-                
-                # Create animations for ALL equations to move to their correct positions
-                animations = []
-                for i, eq in enumerate(displayed_equations):
-                    # Only animate the previous equations if they're not at their final positions
-                    if i < len(displayed_equations) - 1:
-                        animations.append(eq.animate.move_to(final_positions[i]))
-                    else:
-                        # This is the new equation, always animate it
-                        animations.append(eq.animate.move_to(final_positions[i]))
-                
+                eq_mobj.move_to([0, -self.vertical_gap * (self.max_visible), 0])
+
+                # Animate ALL equations (the new one included) to their correct positions
+                animations = [
+                    Glide(eq, position)
+                    for eq, position in zip(displayed_equations, final_positions())
+                ]
+
                 # Play all animations together
-                self.play(*animations, run_time=fade_duration)
-                self.wait(display_time)
+                self.play(*animations, run_time=self.fade_duration)
+                self.wait(self.display_time)
             else:
                 # Case B: We already have 'max_visible' equations visible.
-                # The oldest (topmost) one slides out; 
+                # The oldest (topmost) one slides out;
                 # new one slides in from the bottom.
 
-                # 1) Create a "target" position for everything to shift up
-                # so the top equation slides off-screen, and the new one
-                # appears below. We'll shift the group up by 'vertical_gap'.
-                # Then we'll remove the top eq once the animation finishes.
+                # 1) Slide the top equation up by 'vertical_gap' while fading it out,
+                # then remove it once the animation finishes.
 
                 top_eq = displayed_equations[0]  # the top equation
                 displayed_equations.remove(top_eq)
+                displayed_heights.pop(0)
                 displayed_equations.add(eq_mobj)
-                
-                # Save the position where we want equations to end up
-                final_positions = []
-                temp_group = displayed_equations.copy()
-                position_equations(temp_group)
-                for eq in temp_group:
-                    final_positions.append(eq.get_center())
-                
+                displayed_heights.append(eq_mobj.height)
+
                 # Animate the top equation going out
                 self.play(
-                    top_eq.animate.shift([0, vertical_gap, 0]).set_opacity(0),
-                    run_time=fade_duration
+                    top_eq.animate.shift([0, self.vertical_gap, 0]).set_opacity(0),
+                    run_time=self.fade_duration
                 )
                 self.remove(top_eq)
-                
+
                 # Position the new equation off-screen at the bottom
-                eq_mobj.move_to([0, -vertical_gap * (max_visible), 0])
+                eq_mobj.move_to([0, -self.vertical_gap * (self.max_visible), 0])
                 self.add(eq_mobj)
-                
+
                 # Animate all equations moving to their final positions
-                animations = []
-                for i, eq in enumerate(displayed_equations):
-                    animations.append(eq.animate.move_to(final_positions[i]))
-                
-                self.play(*animations, run_time=fade_duration)
-                
+                animations = [
+                    Glide(eq, position)
+                    for eq, position in zip(displayed_equations, final_positions())
+                ]
+
+                self.play(*animations, run_time=self.fade_duration)
+
                 # Wait for display time
-                self.wait(display_time)
+                self.wait(self.display_time)
 
         # Finally, fade out any remaining equations (optional)
-        self.play(*[FadeOut(eq, run_time=fade_duration) for eq in displayed_equations])
\ No newline at end of file
+        if chunk_end == len(lines):
+            self.play(*[FadeOut(eq, run_time=self.fade_duration) for eq in displayed_equations])
+
+
+def read_equations(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
@@ -0,0 +1,63 @@
+import numpy as np
+from manim import Animation, Mobject
+
+# ----------------------------------------------------------------------------
+# Layout for EquationsScene
+#
+# Target positions come straight from the number of visible equations (and,
+# with equal_gaps, their heights), so nothing has to be copied and positioned
+# just to read back where it would end up. Heights are measured once, when an
+# equation is created, so a layout step costs the same however complex the
+# equations on screen are.
+# ----------------------------------------------------------------------------
+
+
+def stack_positions(heights, screen_height=6.0, equal_gaps=False, min_gap=0.2):
+    """
+    Centers [0, y, 0] for a vertical stack of equations, top to bottom.
+
+    By default the centers divide screen_height evenly: one equation sits in the
+    middle, n equations are spaced screen_height / (n + 1) apart. With equal_gaps
+    the free space between equations is equal instead, which keeps tall equations
+    (fractions, matrices) from crowding their neighbours; if they don't fit, the
+    gaps shrink to min_gap and the stack stays centered.
+    """
+    heights = np.asarray(heights, dtype=float)
+    n = len(heights)
+    if n == 0:
+        return []
+
+    if equal_gaps:
+        gap = max((screen_height - heights.sum()) / (n + 1), min_gap)
+        tops = (heights.sum() + (n - 1) * gap) / 2 - np.concatenate(([0.0], np.cumsum(heights[:-1] + gap)))
+        ys = tops - heights / 2
+    elif n == 1:
+        ys = np.zeros(1)
+    else:
+        spacing = screen_height / (n + 1)
+        ys = screen_height / 2 - spacing * (1 + np.arange(n))
+
+    return [np.array([0.0, y, 0.0]) for y in ys]
+
+
+class Glide(Animation):
+    """
+    Moves a mobject so its center ends up at target.
+
+    Looks the same as mobject.animate.move_to(target), but .animate copies the whole
+    mobject for the target and again for the start; this only keeps two points.
+    """
+
+    def __init__(self, mobject, target, **kwargs):
+        self.target = np.asarray(target, dtype=float)
+        super().__init__(mobject, **kwargs)
+
+    def create_starting_mobject(self):
+        self.start = self.mobject.get_center()
+        self.current = self.start
+        return Mobject()  # nothing to interpolate from besides the start point
+
+    def interpolate_mobject(self, alpha):
+        position = self.start + (self.target - self.start) * self.rate_func(alpha)
+        self.mobject.shift(position - self.current)
+        self.current = position
@@ -0,0 +1,158 @@
+"""
+Render a long equations.txt as several chunks in parallel and join them into one video.
+
+    python render_chunks.py                          # equations.txt -> equations.mp4
+    python render_chunks.py long.txt --chunk-size 20 --workers 8 --output long.mp4
+
+The sequence is split at window boundaries (multiples of max_visible equations).
+Each chunk is an EquationsScene that starts with the previous chunk's last window
+already on screen, exactly where the previous chunk left it, and animates its own
+equations from there, so the joins are seamless. Chunks render in separate processes
+and are joined losslessly: the packets are copied with ffmpeg's concat demuxer
+(through PyAV, which manim already uses), nothing is re-encoded.
+
+Chunk videos are cached in chunk_renders/ under a hash of everything that shows up
+in them: their equations, the carried-over ones, whether they end with the final
+fade-out, the scene code and the video settings. Editing one equation re-renders only
+its chunk (and the next one, if the equation is still on screen when that starts).
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+
+import av
+import manim
+from manim import config, tempconfig
+
+from equation_animator import EquationsScene, read_equations
+from tex_precompile import precompile_equations
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCENE_SOURCES = ['equation_animator.py', 'layout.py']
+DEFAULT_CHUNK_DIR = os.path.join(HERE, 'chunk_renders')
+
+
+def plan_chunks(lines, chunk_size, max_visible):
+    """[(start, end), ...] covering all lines, with boundaries on multiples of max_visible."""
+    chunk_size = max(max_visible, chunk_size - chunk_size % max_visible)
+    return [(start, min(start + chunk_size, len(lines))) for start in range(0, len(lines), chunk_size)]
+
+
+def scene_source_hash():
+    digest = hashlib.sha256()
+    for name in SCENE_SOURCES:
+        with open(os.path.join(HERE, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def chunk_key(lines, start, end, max_visible, source_hash):
+    settings = {
+        'carried_over': lines[max(0, start - max_visible):start],
+        'equations': lines[start:end],
+        'final_fade_out': end == len(lines),
+        'video': [config.pixel_width, config.pixel_height, config.frame_rate, str(config.background_color)],
+        'manim': manim.__version__,
+        'scene': source_hash,
+    }
+    return hashlib.sha256(json.dumps(settings).encode()).hexdigest()[:16]
+
+
+def render_chunk(equations_file, start, end, output_path, media_dir):
+    """Runs in a worker: render equations [start, end) and move the video to output_path."""
+    scene_class = type('EquationsScene', (EquationsScene,),
+                       {'equations_file': equations_file, 'chunk_start': start, 'chunk_end': end,
+                        'compile_workers': 1})
+    started = time.perf_counter()
+    # The shared media_dir keeps manim's Tex cache (filled by the pre-compile step) in
+    # one place; each chunk writes its partial movies under its own subfolder
+    with tempconfig({'media_dir': media_dir, 'video_dir': os.path.join(media_dir, 'chunks', f'{start}'),
+                     'progress_bar': 'none', 'verbosity': 'WARNING'}):
+        scene = scene_class()
+        scene.render()
+        movie = scene.renderer.file_writer.movie_file_path
+    shutil.move(movie, output_path + '.partial')
+    os.replace(output_path + '.partial', output_path)
+    return time.perf_counter() - started
+
+
+def concat_videos(paths, output):
+    """Join videos with identical encoding settings without re-encoding (ffmpeg concat demuxer, -c copy)."""
+    manifest = BytesIO(''.join(f"file 'file:{os.path.abspath(path)}'\n" for path in paths).encode())
+    with av.open(manifest, format='concat', options={'safe': '0', 'an': '1'}) as source:
+        source_stream = source.streams.video[0]
+        with av.open(output, mode='w') as target:
+            target_stream = target.add_stream_from_template(template=source_stream)
+            for packet in source.demux(source_stream):
+                # demux() ends with empty flushing packets
+                if packet.dts is None:
+                    continue
+                # The concat demuxer already offsets every file's pts and dts to follow on from the
+                # previous one. Keep both: the chunks have B-frames, so dts can't be derived from pts
+                packet.stream = target_stream
+                target.mux(packet)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render equations in parallel chunks and join them")
+    parser.add_argument('equations', nargs='?', default='equations.txt')
+    parser.add_argument('--chunk-size', type=int, default=20,
+                        help="equations per chunk, rounded down to a multiple of max_visible")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', help="default: the equations file name with .mp4")
+    parser.add_argument('--chunk-dir', default=DEFAULT_CHUNK_DIR)
+    parser.add_argument('--media-dir', default=os.path.join(HERE, 'media'))
+    args = parser.parse_args()
+
+    equations_file = os.path.abspath(args.equations)
+    output = args.output or os.path.splitext(args.equations)[0] + '.mp4'
+    lines = read_equations(equations_file)
+    max_visible = EquationsScene.max_visible
+    chunks = plan_chunks(lines, args.chunk_size, max_visible)
+    os.makedirs(args.chunk_dir, exist_ok=True)
+
+    source_hash = scene_source_hash()
+    chunk_paths = []
+    pending = {}
+    for start, end in chunks:
+        path = os.path.join(args.chunk_dir, f'{chunk_key(lines, start, end, max_visible, source_hash)}.mp4')
+        chunk_paths.append(path)
+        if not os.path.exists(path):
+            pending[path] = (start, end)
+    print(f"{len(lines)} equations in {len(chunks)} chunks, {len(chunks) - len(pending)} already rendered")
+
+    started = time.perf_counter()
+    if pending:
+        # Compile the LaTeX of every chunk that needs rendering once, before the workers start
+        with tempconfig({'media_dir': args.media_dir}):
+            precompile_equations([line for start, end in pending.values()
+                                  for line in lines[max(0, start - max_visible):end]])
+
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = {executor.submit(render_chunk, equations_file, start, end, path, args.media_dir): path
+                       for path, (start, end) in pending.items()}
+            failed = False
+            for future in as_completed(futures):
+                start, end = pending[futures[future]]
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    print(f"Chunk {start}-{end - 1} failed: {e}")
+                    failed = True
+                    continue
+                print(f"Chunk {start}-{end - 1} rendered in {seconds:.1f}s")
+        if failed:
+            raise SystemExit("Not joining the video, some chunks failed")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Join into a temporary file first so a failed join never replaces a good video
+        joined = os.path.join(tmp, os.path.basename(output))
+        concat_videos(chunk_paths, joined)
+        shutil.move(joined, output)
+    print(f"Wrote {output} in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import manim
+from manim import MathTex, config
+from manim.utils.tex_file_writing import delete_nonsvg_files
+
+# ----------------------------------------------------------------------------
+# LaTeX pre-compilation for EquationsScene
+#
+# Every MathTex runs latex + dvisvgm the first time its expression is seen and
+# stores the SVG in manim's Tex folder (media/Tex/<hash>.svg); later MathTex
+# calls with the same expression just load that SVG. precompile_equations()
+# fills that folder for all distinct equations at once, in a process pool,
+# before the scene starts, so the MathTex calls inside the animation loop
+# never wait on LaTeX.
+#
+# equation_cache.json next to the Tex folder remembers which equations are
+# already compiled (keyed by the equation, environment and TeX template), so a
+# re-render after adding one equation only compiles that one.
+# ----------------------------------------------------------------------------
+
+TEX_ENVIRONMENT = "align*"  # MathTex's default
+
+
+def equation_key(equation, tex_template):
+    digest = hashlib.sha256()
+    for part in (manim.__version__, TEX_ENVIRONMENT, tex_template.tex_compiler,
+                 tex_template.output_format, tex_template.body, equation):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def cache_path():
+    return Path(config.get_dir("tex_dir")).parent / "equation_cache.json"
+
+
+def load_cache():
+    path = cache_path()
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache):
+    path = cache_path()
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def compile_equation(equation, tex_dir, tex_template):
+    """Runs in a worker: build the MathTex once so manim writes its SVG into tex_dir."""
+    config.tex_dir = tex_dir
+    # Cleanup deletes every .dvi/.log in the folder, including those of equations
+    # other workers are still compiling; the parent cleans up once at the end
+    config.no_latex_cleanup = True
+    return str(MathTex(equation, tex_template=tex_template).file_name)
+
+
+def precompile_equations(equations, workers=None):
+    """
+    Compile every distinct equation that isn't cached yet. Returns the number compiled.
+
+    Equations that fail to compile are reported and skipped here; the MathTex in the
+    scene will raise the usual LaTeX error for them.
+    """
+    tex_template = config.tex_template
+    tex_dir = str(config.get_dir("tex_dir"))
+    os.makedirs(tex_dir, exist_ok=True)
+    cache = load_cache()
+
+    # Dedupe by content hash, keeping the first occurrence of each equation
+    pending = {}
+    for equation in equations:
+        key = equation_key(equation, tex_template)
+        cached = cache.get(key)
+        if cached and os.path.exists(cached["svg"]):
+            continue
+        pending.setdefault(key, equation)
+
+    distinct = len({equation_key(equation, tex_template) for equation in equations})
+    if not pending:
+        print(f"All {distinct} distinct equations already compiled")
+        return 0
+
+    workers = min(workers or os.cpu_count(), len(pending))
+    print(f"Compiling {len(pending)} of {distinct} distinct equations with {workers} processes")
+    compiled = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(compile_equation, equation, tex_dir, tex_template): key
+                   for key, equation in pending.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                svg = future.result()
+            except Exception as e:
+                print(f"Could not compile {pending[key]!r}: {e}")
+                continue
+            cache[key] = {"equation": pending[key], "svg": svg}
+            compiled += 1
+    save_cache(cache)
+
+    if not config.no_latex_cleanup:
+        delete_nonsvg_files()
+    return compiled
@@ -0,0 +1,261 @@
+"""
+Render-time benchmark for the manim scenes in spiral/ and animation/.
+
+    python render_bench.py                                   # default matrix, report in render_bench.json
+    python render_bench.py --scenes spiral --quality high_quality --spiral-n 150 300
+    python render_bench.py --compare baseline.json           # exit code 1 if a case got slower
+    python render_bench.py --no-instrumentation              # plain renders, wall time and memory only
+
+Every case (scene x quality preset x size) renders in a fresh process with an empty
+media folder, so LaTeX is compiled from scratch and peak RSS belongs to that case
+alone. The report records, per case:
+
+    wall_seconds          scene construction + render + movie file
+    plays                 time of every self.play / self.wait call, in order
+    frame_render_seconds  camera drawing the mobjects
+    frame_write_seconds   encoding frames into the partial movie files
+    combine_seconds       joining the partial movies into the final video
+    latex_seconds         latex + dvisvgm in the scene process, plus the wall time of
+                          EquationsScene's parallel pre-compile step
+    peak_rss_mb           peak resident memory of the render process (and of its
+                          LaTeX worker processes, separately)
+
+Sizes are the number of segments N for CornuSpiral and the number of equations for
+EquationsScene (generated, all distinct, so each one needs its own compile).
+
+The breakdown comes from wrapping manim's methods with timers (the originals still do
+all the work). --no-instrumentation renders without touching manim at all and reports
+only wall_seconds, frames (read back from the video) and peak RSS, to check that the
+wrappers don't skew the totals.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENE_DIRS = {'spiral': os.path.join(ROOT, 'spiral'), 'equations': os.path.join(ROOT, 'animation')}
+
+SAMPLE_EQUATIONS = [
+    r"E = mc^2",
+    r"\frac{d}{dx} e^x = e^x",
+    r"a^2 + b^2 = c^2",
+    r"e^{i\pi} + 1 = 0",
+    r"\int_0^\infty e^{-x^2}\,dx = \frac{\sqrt{\pi}}{2}",
+    r"\sum_{n=1}^\infty \frac{1}{n^2} = \frac{\pi^2}{6}",
+    r"\nabla \cdot \mathbf{E} = \frac{\rho}{\varepsilon_0}",
+    r"\hat{H}\psi = i\hbar \frac{\partial \psi}{\partial t}",
+]
+
+
+def make_equations(count):
+    """count distinct equations, cycling through the samples and numbering them."""
+    return [f"{SAMPLE_EQUATIONS[i % len(SAMPLE_EQUATIONS)]} \\qquad ({i + 1})" for i in range(count)]
+
+
+class Timers:
+    def __init__(self):
+        self.seconds = {}
+        self.frames = 0
+        self.plays = []
+
+    def wrap(self, owner, attribute, name):
+        """Replace owner.attribute with a version that adds its run time to `name`."""
+        original = getattr(owner, attribute)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+        setattr(owner, attribute, timed)
+
+
+def instrument_manim(timers):
+    """Wrap manim's drawing, encoding, LaTeX and play/wait methods with timers."""
+    from manim import Scene
+    from manim.camera.camera import Camera
+    from manim.scene.scene_file_writer import SceneFileWriter
+    from manim.utils import tex_file_writing
+
+    timers.wrap(Camera, 'capture_mobjects', 'frame_render')
+    timers.wrap(SceneFileWriter, 'combine_to_movie', 'combine')
+    timers.wrap(tex_file_writing, 'compile_tex', 'latex')
+    timers.wrap(tex_file_writing, 'convert_to_svg', 'latex')
+
+    write_frame = SceneFileWriter.write_frame
+
+    def counted_write_frame(self, frame, *, repeat=1):
+        timers.frames += repeat  # a wait with nothing moving writes one frame repeated
+        return write_frame(self, frame, repeat=repeat)
+
+    SceneFileWriter.write_frame = counted_write_frame
+    timers.wrap(SceneFileWriter, 'write_frame', 'frame_write')
+
+    def timed_call(method, kind):
+        def call(self, *args, **kwargs):
+            start = time.perf_counter()
+            result = method(self, *args, **kwargs)
+            names = [type(arg).__name__ for arg in args] if kind == 'play' else []
+            timers.plays.append({'kind': kind, 'animations': names, 'seconds': round(time.perf_counter() - start, 4)})
+            return result
+        return call
+
+    Scene.play = timed_call(Scene.play, 'play')
+    Scene.wait = timed_call(Scene.wait, 'wait')
+
+
+def count_video_frames(path):
+    """Frames in the rendered video, from its packets (one per frame), without decoding."""
+    import av
+    with av.open(path) as container:
+        return sum(1 for packet in container.demux(container.streams.video[0]) if packet.size)
+
+
+def run_case(scene, quality, size, instrument=True):
+    """Runs in a fresh process: render one case and return its measurements."""
+    sys.path.insert(0, SCENE_DIRS[scene])
+    import manim
+    from manim import tempconfig
+
+    timers = Timers()
+    if instrument:
+        instrument_manim(timers)
+
+    with tempfile.TemporaryDirectory() as media_dir:
+        if scene == 'spiral':
+            from main import CornuSpiral
+            scene_class = type('CornuSpiral', (CornuSpiral,), {'N': size})
+        else:
+            import equation_animator
+            equations_file = os.path.join(media_dir, 'equations.txt')
+            with open(equations_file, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(make_equations(size)) + '\n')
+            if instrument:
+                timers.wrap(equation_animator, 'precompile_equations', 'latex')
+            scene_class = type('EquationsScene', (equation_animator.EquationsScene,),
+                               {'equations_file': equations_file})
+
+        with tempconfig({'quality': quality, 'media_dir': media_dir, 'disable_caching': True,
+                         'progress_bar': 'none', 'verbosity': 'WARNING'}):
+            start = time.perf_counter()
+            scene_instance = scene_class()
+            scene_instance.render()
+            wall = time.perf_counter() - start
+            frames = timers.frames if instrument else count_video_frames(
+                scene_instance.renderer.file_writer.movie_file_path)
+
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    rss_bytes = 1 if sys.platform == 'darwin' else 1024
+    # Without instrumentation there is no breakdown, only the totals
+    breakdown = (lambda name: round(timers.seconds.get(name, 0.0), 3)) if instrument else (lambda name: None)
+    return {
+        'scene': scene,
+        'quality': quality,
+        'size': size,
+        'instrumented': instrument,
+        'wall_seconds': round(wall, 3),
+        'frames': frames,
+        'frame_render_seconds': breakdown('frame_render'),
+        'frame_write_seconds': breakdown('frame_write'),
+        'combine_seconds': breakdown('combine'),
+        'latex_seconds': breakdown('latex'),
+        'plays': timers.plays if instrument else None,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * rss_bytes / 2**20, 1),
+        'peak_rss_children_mb': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * rss_bytes / 2**20, 1),
+        'manim_version': manim.__version__,
+    }
+
+
+def run_isolated(scene, quality, size, instrument=True):
+    # spawn rather than fork, so the peak RSS isn't inherited from this process
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(run_case, scene, quality, size, instrument).result()
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def case_id(case):
+    return f"{case['scene']}/{case['quality']}/{case['size']}"
+
+
+def compare(report, baseline, threshold):
+    """Print the change in wall time per case; returns the ids of cases that got slower than threshold."""
+    previous = {case_id(case): case for case in baseline['cases']}
+    regressions = []
+    for case in report['cases']:
+        old = previous.get(case_id(case))
+        if old is None:
+            print(f"{case_id(case)}: new case, {case['wall_seconds']:.2f}s")
+            continue
+        change = case['wall_seconds'] / old['wall_seconds'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(case_id(case))
+        print(f"{case_id(case)}: {old['wall_seconds']:.2f}s -> {case['wall_seconds']:.2f}s ({change:+.1%}){flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark render times of CornuSpiral and EquationsScene")
+    parser.add_argument('--scenes', nargs='+', choices=list(SCENE_DIRS), default=list(SCENE_DIRS))
+    parser.add_argument('--quality', nargs='+', default=['low_quality', 'high_quality'],
+                        help="manim quality presets (low_quality, medium_quality, high_quality, ...)")
+    parser.add_argument('--spiral-n', nargs='+', type=int, default=[50, 150, 300], help="CornuSpiral segment counts")
+    parser.add_argument('--equations', nargs='+', type=int, default=[5, 20, 50], help="EquationsScene equation counts")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per case; the fastest is reported")
+    parser.add_argument('--output', default='render_bench.json')
+    parser.add_argument('--compare', help="earlier report to compare wall times against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="slowdown counted as a regression (0.10 = 10%%)")
+    parser.add_argument('--no-instrumentation', action='store_true',
+                        help="render without any timers wrapped around manim; wall time, frames and memory only")
+    args = parser.parse_args()
+
+    sizes = {'spiral': args.spiral_n, 'equations': args.equations}
+    cases = []
+    for scene in args.scenes:
+        for quality in args.quality:
+            for size in sizes[scene]:
+                runs = [run_isolated(scene, quality, size, not args.no_instrumentation) for _ in range(args.repeat)]
+                best = min(runs, key=lambda run: run['wall_seconds'])
+                best['runs_wall_seconds'] = [run['wall_seconds'] for run in runs]
+                cases.append(best)
+                details = (f" (draw {best['frame_render_seconds']:.2f}s, write {best['frame_write_seconds']:.2f}s, "
+                           f"latex {best['latex_seconds']:.2f}s)" if best['instrumented'] else "")
+                print(f"{case_id(best)}: {best['wall_seconds']:.2f}s, {best['frames']} frames{details}, "
+                      f"peak RSS {best['peak_rss_mb']:.0f} MB")
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'cases': cases,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} case(s) slower than {args.threshold:.0%}: {', '.join(regressions)}")
@@ -0,0 +1,231 @@
+"""
+Offline throughput benchmark for scrape_curius.py and youtube_scraper.py.
+
+    python scraper_bench.py                                  # every mode, report in scraper_bench.json
+    python scraper_bench.py --curius-modes api batch-api --bookmarks 3000 --users 8
+    python scraper_bench.py --youtube-modes search uploads --videos 2000 --latency 0.05 --quota-limit 10000
+
+Both scrapers run against local stand-ins that this script starts in-process:
+
+    curius_standin.py    the Curius JSON API and a client-rendered page for headless
+                         Chrome; --bookmarks / --page-size set the page count and
+                         --render-delay how long each page takes to render
+    mock_youtube_api.py  search, playlistItems and videos endpoints; --latency is
+                         added to every response and --quota-limit caps the units
+                         one run may spend before the mock answers quotaExceeded
+
+Every mode runs in a fresh process, so peak memory is that mode's alone (Chrome and
+other child processes are reported separately); the stand-ins count the calls and
+quota units they serve.
+
+Curius modes: api, selenium (one user), batch-api, batch-selenium (--users users with
+--workers threads). YouTube modes: search, uploads (paging the uploads playlist) and
+search-warm, uploads-warm, which repeat the run with the ETag cache the first one left.
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CURIUS_DIR = os.path.join(ROOT, 'scrape_curius')
+YOUTUBE_DIR = os.path.join(ROOT, 'yt scraper')
+CURIUS_MODES = ['api', 'selenium', 'batch-api', 'batch-selenium']
+YOUTUBE_MODES = ['search', 'search-warm', 'uploads', 'uploads-warm']
+
+
+def peak_memory():
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    rss_bytes = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * rss_bytes / 2**20, 1),
+        'peak_rss_children_mb': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * rss_bytes / 2**20, 1),
+    }
+
+
+def run_curius(mode, base_url, usernames, workers, out_dir):
+    """Runs in a fresh process: scrape the stand-in in one mode, return the bookmark count and timings."""
+    sys.path.insert(0, CURIUS_DIR)
+    import scrape_curius
+
+    # The scraper reports every page; keep that out of the benchmark output
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if mode.startswith('batch-'):
+            counts = scrape_curius.scrape_users(usernames, base_url, mode[len('batch-'):], workers, out_dir)
+            items = sum(counts.values())
+        else:
+            pages = scrape_curius.iter_pages(f"{base_url}/{usernames[0]}", mode)
+            items = scrape_curius.export_bookmarks(pages, os.path.join(out_dir, 'curius_bookmarks.csv'))
+        wall = time.perf_counter() - start
+    return {'items': items, 'wall_seconds': round(wall, 3), **peak_memory()}
+
+
+def run_youtube(source, endpoint, work_dir):
+    """Runs in a fresh process: save the mock channel's videos, caching in work_dir."""
+    # Never send a real key, even to localhost; set before youtube_scraper reads .env
+    os.environ['YOUTUBE_API_KEY'] = 'benchmark'
+    os.environ['YOUTUBE_API_ENDPOINT'] = endpoint
+    sys.path.insert(0, YOUTUBE_DIR)
+    os.chdir(work_dir)  # get_channel_videos writes its CSV to the working directory
+    import pandas as pd
+    from googleapiclient.errors import HttpError
+    import youtube_scraper
+    from youtube_cache import CachedYouTube
+
+    youtube = CachedYouTube(youtube_scraper.youtube._client,
+                            cache_file=os.path.join(work_dir, 'youtube_cache.json'),
+                            quota_file=os.path.join(work_dir, 'youtube_quota.json'))
+    youtube_scraper.youtube = youtube
+
+    error = None
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        try:
+            youtube_scraper.get_channel_videos(source)
+        except HttpError as e:
+            error = f"HTTP {e.resp.status}: {e.reason}"
+        wall = time.perf_counter() - start
+        youtube.flush()
+
+    csv_path = os.path.join(work_dir, 'veritasium_videos.csv')
+    items = len(pd.read_csv(csv_path)) if error is None and os.path.exists(csv_path) else 0
+    if os.path.exists(csv_path):
+        os.remove(csv_path)
+    return {
+        'items': items,
+        'wall_seconds': round(wall, 3),
+        'client_calls': dict(youtube.calls),
+        'client_not_modified': dict(youtube.not_modified),
+        'error': error,
+        **peak_memory(),
+    }
+
+
+def run_isolated(function, *args):
+    # spawn rather than fork, so the peak RSS isn't inherited from this process
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(function, *args).result()
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_curius(modes, args):
+    sys.path.insert(0, CURIUS_DIR)
+    from curius_standin import load_bookmarks, start_server
+
+    server = start_server(bookmarks=load_bookmarks(count=args.bookmarks), page_size=args.page_size,
+                          render_delay=args.render_delay)
+    host, port = server.server_address[:2]
+    base_url = f"http://{host}:{port}"
+    cases = []
+    for mode in modes:
+        usernames = [f"bench{i}" for i in range(args.users)] if mode.startswith('batch-') else [server.username]
+        with server.lock:
+            server.api_requests = 0
+        case = {'scraper': 'curius', 'mode': mode, 'users': len(usernames)}
+        with tempfile.TemporaryDirectory() as out_dir:
+            try:
+                case.update(run_isolated(run_curius, mode, base_url, usernames, args.workers, out_dir))
+            except Exception as e:
+                case['error'] = f"{type(e).__name__}: {e}"
+        case['api_calls'] = server.api_requests
+        cases.append(case)
+    server.shutdown()
+    return cases
+
+
+def benchmark_youtube(modes, args):
+    sys.path.insert(0, YOUTUBE_DIR)
+    from mock_youtube_api import start_server
+
+    server = start_server(video_count=args.videos, latency=args.latency, quota_limit=args.quota_limit)
+    cases = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in modes:
+            source = mode.removesuffix('-warm')
+            work_dir = os.path.join(tmp, source)
+            if not os.path.exists(work_dir):
+                os.makedirs(work_dir)
+                if mode.endswith('-warm'):
+                    # Nothing has filled this source's cache yet; do an unreported run first
+                    run_isolated(run_youtube, source, server.url, work_dir)
+
+            server.reset_counters()
+            case = {'scraper': 'youtube', 'mode': mode}
+            try:
+                case.update(run_isolated(run_youtube, source, server.url, work_dir))
+            except Exception as e:
+                case['error'] = f"{type(e).__name__}: {e}"
+            with server.lock:
+                case['api_calls'] = sum(server.requests.values())
+                case['calls_by_endpoint'] = dict(server.requests)
+                case['not_modified'] = sum(server.not_modified.values())
+                case['quota_units'] = server.quota_used
+            cases.append(case)
+    server.shutdown()
+    return cases
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Curius and YouTube scrapers against local stand-ins")
+    parser.add_argument('--curius-modes', nargs='*', choices=CURIUS_MODES, default=CURIUS_MODES)
+    parser.add_argument('--youtube-modes', nargs='*', choices=YOUTUBE_MODES, default=YOUTUBE_MODES)
+    parser.add_argument('--output', default='scraper_bench.json')
+
+    curius = parser.add_argument_group('Curius stand-in')
+    curius.add_argument('--bookmarks', type=int, default=1500, help="bookmarks per user")
+    curius.add_argument('--page-size', type=int, default=30)
+    curius.add_argument('--render-delay', type=float, default=0.0, help="seconds to render each page in the browser")
+    curius.add_argument('--users', type=int, default=8, help="users scraped by the batch modes")
+    curius.add_argument('--workers', type=int, default=4, help="parallel users in the batch modes")
+
+    youtube = parser.add_argument_group('YouTube mock')
+    youtube.add_argument('--videos', type=int, default=1000, help="videos on the mock channel")
+    youtube.add_argument('--latency', type=float, default=0.0, help="seconds added to every API response")
+    youtube.add_argument('--quota-limit', type=int, help="quota units each run may spend")
+    args = parser.parse_args()
+
+    cases = benchmark_curius(args.curius_modes, args) + benchmark_youtube(args.youtube_modes, args)
+    for case in cases:
+        name = f"{case['scraper']}/{case['mode']}"
+        unit = 'bookmarks' if case['scraper'] == 'curius' else 'videos'
+        if 'wall_seconds' in case:
+            case[f'{unit}_per_second'] = round(case['items'] / case['wall_seconds'], 1) if case['wall_seconds'] else None
+        if case.get('error') and 'wall_seconds' not in case:
+            print(f"{name}: failed ({case['error']})")
+            continue
+        quota = f", {case['quota_units']} quota units" if 'quota_units' in case else ''
+        failed = f" [stopped: {case['error']}]" if case.get('error') else ''
+        print(f"{name}: {case['items']} {unit} in {case['wall_seconds']:.2f}s "
+              f"({case[f'{unit}_per_second'] or 0:.0f}/s), {case['api_calls']} API calls{quota}, "
+              f"peak RSS {case['peak_rss_mb']:.0f} MB{failed}")
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': vars(args),
+        'cases': cases,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
@@ -0,0 +1,91 @@
+import time
+from collections import deque
+
+# Helpers for redrawing only the parts of the figure that change when the slider moves.
+# See https://matplotlib.org/stable/users/explain/animations/blitting.html
+
+
+class BlitManager:
+    """
+    Caches everything except the animated artists as a background image.
+    update() restores that image, draws the animated artists on top and blits
+    the result, instead of redrawing axes, grid, legend and scatter every time.
+    """
+
+    def __init__(self, canvas, animated_artists=()):
+        self.canvas = canvas
+        self._background = None
+        self._artists = []
+        for artist in animated_artists:
+            self.add_artist(artist)
+        # A full draw (first show, resize, zoom) refreshes the cached background
+        self.cid = canvas.mpl_connect("draw_event", self.on_draw)
+
+    def add_artist(self, artist):
+        artist.set_animated(True)
+        self._artists.append(artist)
+
+    def on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        figure = self.canvas.figure
+        for artist in self._artists:
+            figure.draw_artist(artist)
+
+    def update(self):
+        if self._background is None:
+            self.on_draw(None)
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
+
+
+class FPSCounter:
+    """
+    Frame rate over the last `window` frames, and the latency from a slider
+    event (start()) to the frame that shows it (frame()).
+    """
+
+    def __init__(self, window=30):
+        self.frame_times = deque(maxlen=window)
+        self.latencies = deque(maxlen=window)
+        self.total_frames = 0
+        self.total_latency = 0.0
+        self._pending = None
+
+    def start(self):
+        if self._pending is None:
+            self._pending = time.perf_counter()
+
+    def frame(self):
+        now = time.perf_counter()
+        self.frame_times.append(now)
+        if self._pending is not None:
+            latency = now - self._pending
+            self.latencies.append(latency)
+            self.total_frames += 1
+            self.total_latency += latency
+            self._pending = None
+
+    @property
+    def fps(self):
+        if len(self.frame_times) < 2:
+            return 0.0
+        return (len(self.frame_times) - 1) / (self.frame_times[-1] - self.frame_times[0])
+
+    @property
+    def latency_ms(self):
+        return 1e3 * sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    def label(self):
+        return f"{self.fps:.1f} FPS, {self.latency_ms:.1f} ms/frame"
+
+    def summary(self):
+        if not self.total_frames:
+            return "No slider frames rendered"
+        mean_ms = 1e3 * self.total_latency / self.total_frames
+        return f"{self.total_frames} slider frames, mean {mean_ms:.1f} ms/frame (max {1e3 / mean_ms:.0f} FPS)"
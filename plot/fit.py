@@ -0,0 +1,193 @@
+"""
+Least-squares fit of Planck's constant (and optionally the temperature) to
+measured blackbody spectra.
+
+    python fit.py experimental_data.csv
+    python fit.py spectra/*.csv --fit-temperature
+
+Spectra are CSVs in the format main.py writes (wavelength_um, intensity in
+MW⋅sr⁻¹⋅m⁻²⋅nm⁻¹). All spectra are fitted together: residuals and the analytic
+Jacobian are computed for the whole batch at once and every Levenberg-Marquardt
+step solves the small normal equations for all spectra in one call, so
+thousands of spectra fit in a fraction of a second.
+"""
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+
+from planck import c, k_B, h_actual, WIEN_X
+
+
+def planck_and_jacobian(wavelengths_um, h_multiplier, temperature):
+    """
+    Radiance in MW⋅sr⁻¹⋅m⁻²⋅nm⁻¹ and its derivatives with respect to the h
+    multiplier m and the temperature T.
+
+    With B = 2hc²/λ⁵ and u = mhc/(λk_BT):  I = Bm / (eᵘ - 1)
+        ∂I/∂m = I/m · (1 - u·g)        ∂I/∂T = I/T · u·g        g = eᵘ/(eᵘ - 1) = 1 + 1/(eᵘ - 1)
+    Written with expm1 so large u just gives I = 0 and g = 1 instead of inf/inf.
+    """
+    lam = wavelengths_um * 1e-6
+    m = h_multiplier[..., np.newaxis]
+    T = temperature[..., np.newaxis]
+    u = m * (h_actual*c) / (lam*k_B*T)
+    with np.errstate(over='ignore'):
+        em1 = np.expm1(u)
+    radiance = 1e-6 * (2*h_actual*c**2) / lam**5 * m / em1
+    ug = u * (1 + 1/em1)
+    d_m = radiance / m * (1 - ug)
+    d_T = radiance / T * ug
+    return radiance, d_m, d_T
+
+
+def fit_spectra(wavelengths_um, intensities, temperatures, fit_temperature=False, mask=None,
+                h_guess=None, max_iterations=100, tolerance=1e-8):
+    """
+    Fit every spectrum (row) in a batch.
+
+    wavelengths_um, intensities: arrays of shape (spectra, points). Spectra of
+    different lengths can be padded and have the padding switched off with mask.
+    temperatures: known temperature per spectrum, or the starting guess when
+    fit_temperature is True.
+
+    Returns a dict of arrays with one entry per spectrum: h_multiplier, h,
+    h_multiplier_err, h_err, temperature, temperature_err, rms, iterations,
+    converged.
+    """
+    lam = np.atleast_2d(np.asarray(wavelengths_um, dtype=float))
+    y = np.atleast_2d(np.asarray(intensities, dtype=float))
+    weights = np.ones_like(y) if mask is None else np.atleast_2d(mask).astype(float)
+    # Points at λ = 0 carry no information and would divide by zero
+    weights = np.where(lam > 0, weights, 0.0)
+    lam = np.where(lam > 0, lam, 1.0)
+    n_spectra = y.shape[0]
+    T = np.broadcast_to(np.asarray(temperatures, dtype=float), (n_spectra,)).copy()
+
+    if h_guess is None:
+        # Start from the multiplier that puts Wien's peak at the brightest measured point
+        peak_lambda = lam[np.arange(n_spectra), np.argmax(y * weights, axis=1)] * 1e-6
+        m = peak_lambda * WIEN_X * k_B * T / (h_actual*c)
+    else:
+        m = np.broadcast_to(np.asarray(h_guess, dtype=float), (n_spectra,)).copy()
+
+    n_params = 2 if fit_temperature else 1
+    damping = np.full(n_spectra, 1e-3)
+    iterations = np.zeros(n_spectra, dtype=int)
+    converged = np.zeros(n_spectra, dtype=bool)
+
+    def residuals_and_jacobian(m, T):
+        model, d_m, d_T = planck_and_jacobian(lam, m, T)
+        residuals = (model - y) * weights
+        jacobian = (np.stack([d_m, d_T], axis=-1) if fit_temperature else d_m[..., np.newaxis])
+        return residuals, jacobian * weights[..., np.newaxis]
+
+    residuals, jacobian = residuals_and_jacobian(m, T)
+    cost = np.sum(residuals**2, axis=1)
+
+    for _ in range(max_iterations):
+        active = ~converged
+        if not active.any():
+            break
+        iterations[active] += 1
+
+        # Damped normal equations (JᵀJ + λ·diag(JᵀJ)) δ = -Jᵀr for every spectrum at once
+        jacobian_t = jacobian.transpose(0, 2, 1)
+        jtj = jacobian_t @ jacobian
+        jtr = (jacobian_t @ residuals[..., np.newaxis])[..., 0]
+        diagonal = np.einsum('spp->sp', jtj)
+        damped = jtj + (damping[:, np.newaxis] * diagonal)[..., np.newaxis] * np.eye(n_params)
+        damped += np.eye(n_params) * 1e-300  # keep dead spectra (all-zero Jacobian) solvable
+        step = np.linalg.solve(damped, -jtr[..., np.newaxis])[..., 0]
+        step[converged] = 0
+
+        new_m = np.clip(m + step[:, 0], 1e-3, None)
+        new_T = np.clip(T + step[:, 1], 1.0, None) if fit_temperature else T
+        new_residuals, new_jacobian = residuals_and_jacobian(new_m, new_T)
+        new_cost = np.sum(new_residuals**2, axis=1)
+
+        # Accept improving steps and relax the damping; otherwise damp harder and retry
+        improved = active & (new_cost <= cost)
+        relative_step = np.abs(step[:, 0]) / np.maximum(m, 1e-300)
+        if fit_temperature:
+            relative_step = np.maximum(relative_step, np.abs(step[:, 1]) / T)
+        converged |= improved & ((relative_step < tolerance) | (cost - new_cost <= tolerance * cost))
+
+        m = np.where(improved, new_m, m)
+        T = np.where(improved, new_T, T)
+        cost = np.where(improved, new_cost, cost)
+        residuals = np.where(improved[:, np.newaxis], new_residuals, residuals)
+        jacobian = np.where(improved[:, np.newaxis, np.newaxis], new_jacobian, jacobian)
+        damping = np.where(improved, damping / 10, damping * 10)
+        converged |= active & (damping > 1e16)  # no further progress possible
+
+    # Parameter covariance s²(JᵀJ)⁻¹ with s² = RSS / (N - p)
+    n_points = weights.sum(axis=1)
+    dof = np.maximum(n_points - n_params, 1)
+    jtj = jacobian.transpose(0, 2, 1) @ jacobian
+    covariance = np.linalg.pinv(jtj) * (cost / dof)[:, np.newaxis, np.newaxis]
+    errors = np.sqrt(np.abs(np.einsum('spp->sp', covariance)))
+
+    return {
+        'h_multiplier': m,
+        'h': m * h_actual,
+        'h_multiplier_err': errors[:, 0],
+        'h_err': errors[:, 0] * h_actual,
+        'temperature': T,
+        'temperature_err': errors[:, 1] if fit_temperature else np.zeros(n_spectra),
+        'rms': np.sqrt(cost / np.maximum(n_points, 1)),
+        'iterations': iterations,
+        'converged': converged,
+    }
+
+
+def load_spectra(paths):
+    """Read spectrum CSVs and pad them into (spectra, points) arrays plus a mask."""
+    spectra = [np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2) for path in paths]
+    length = max(len(s) for s in spectra)
+    wavelengths = np.ones((len(spectra), length))
+    intensities = np.zeros((len(spectra), length))
+    mask = np.zeros((len(spectra), length), dtype=bool)
+    for i, spectrum in enumerate(spectra):
+        finite = np.isfinite(spectrum).all(axis=1)
+        n = len(spectrum)
+        wavelengths[i, :n] = spectrum[:, 0]
+        intensities[i, :n] = np.where(finite, spectrum[:, 1], 0.0)
+        mask[i, :n] = finite
+    return wavelengths, intensities, mask
+
+
+def temperature_from_name(path, default):
+    """blackbody_4000K.csv -> 4000; anything without a temperature in its name gets the default."""
+    match = re.search(r'(\d+(?:\.\d+)?)K', os.path.basename(path))
+    return float(match.group(1)) if match else default
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit Planck's constant to measured blackbody spectra")
+    parser.add_argument('spectra', nargs='*', default=['experimental_data.csv'])
+    parser.add_argument('--temperature', type=float, default=5000,
+                        help="temperature (K) for files without one in their name, e.g. blackbody_4000K.csv")
+    parser.add_argument('--fit-temperature', action='store_true',
+                        help="fit T as well, using the known temperature as the starting point")
+    args = parser.parse_args()
+
+    wavelengths, intensities, mask = load_spectra(args.spectra)
+    temperatures = [temperature_from_name(path, args.temperature) for path in args.spectra]
+
+    start = time.perf_counter()
+    result = fit_spectra(wavelengths, intensities, temperatures, args.fit_temperature, mask)
+    elapsed = time.perf_counter() - start
+
+    for i, path in enumerate(args.spectra):
+        line = (f"{path}: h = {result['h'][i]:.6e} ± {result['h_err'][i]:.1e} J⋅s "
+                f"({result['h_multiplier'][i]:.6f} × h_actual)")
+        if args.fit_temperature:
+            line += f", T = {result['temperature'][i]:.1f} ± {result['temperature_err'][i]:.1f} K"
+        line += f", residual RMS {result['rms'][i]:.4g} MW⋅sr⁻¹⋅m⁻²⋅nm⁻¹"
+        if not result['converged'][i]:
+            line += " (not converged)"
+        print(line)
+    print(f"Fitted {len(args.spectra)} spectra in {elapsed * 1e3:.1f} ms")
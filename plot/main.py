@@ -1,14 +1,24 @@
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
+from planck import h_actual, I, I_classical, PlanckGrid
+from surface import RadianceSurface, surface_nbytes
+from blitting import BlitManager, FPSCounter
+from fit import fit_spectra
+from sampling import adaptive_wavelengths
+from spectra import load_spectrum, DecimatedSpectrum
 
 
 # AFTER YOU SLIDE THE CURVE, YOU CAN SAVE THE CURVE TO CSV FILES BY HOLDING DOWN THE 's' KEY
+# PRESS 'b' TO JUMP THE SLIDER TO THE LEAST-SQUARES BEST FIT FOR THE EXPERIMENTAL DATA
 
 # VARIABLES YOU CAN CHANGE
 points_count = 1000  # Adjust this for lower/higher resolution
-wavelengths = np.linspace(0,6e-6,points_count)  # Using points_count instead of hardcoded 1000
+max_wavelength = 6e-6  # in meters
+wavelengths = np.linspace(0,max_wavelength,points_count)  # Using points_count instead of hardcoded 1000
 temperatures = [3000,4000,5000]# list of temperatures to plot
+experimental_temperature = 5000  # temperature of the "experiment" the h fit is measured against
 
 # axis limits
 y_max = 1.4e7  # Change based on your observation. this is what works for temperatures 3000, 4000, 5000
@@ -21,20 +31,47 @@ x_max = 6  # maximum wavelength in μm
 h_min = 0.1
 h_max = 2.0
 
-
-
-
-c = 299792458 # speed of light (m/s)
-k_B = 1.380649e-23 # Boltzmann constant (J/K)
-h_actual = 6.62607015e-34 # Actual Planck constant (J*s)
-
-def I(lambdaa, temperature, h):
-    # temperature in Kelvin
-    # Returns spectral radiance in W⋅sr⁻¹⋅m⁻²⋅m⁻¹
-    return (2*h*c**2)/(lambdaa**5) * 1/(np.exp((h*c)/(lambdaa*k_B*temperature)) - 1)
-
-def I_classical(lambdaa, temperature):
-    return (2*c*k_B*temperature)/(lambdaa**4)
+# place wavelength points where the curves bend instead of evenly (replaces points_count)
+# a few hundred points then look the same as thousands of evenly spaced ones over the whole slider range
+adaptive_sampling = False
+sampling_tolerance = 1e-3  # max straight-line error between points, as a fraction of each curve's peak
+
+# precompute the curves for the whole slider range once and cache them in .radiance_cache/
+# slider moves then just interpolate; later launches with the same settings skip the computation
+# the file is surface_samples × temperatures × wavelength points × 4 bytes: 3 MB for 256 × 3 × 1000,
+# but 3 GB for 256 × 3 × 10⁶ points
+use_lookup_surface = True
+surface_samples = 256  # number of h values in the precomputed surface (more = more accurate, bigger file)
+max_surface_mb = 512  # if the file would be bigger, skip the surface and compute the curves on every slider move
+
+# only redraw the temperature curves and title when the slider moves, instead of the whole figure
+use_blitting = True
+show_fps = True  # frame rate / per-frame latency in the corner, and a summary printed on close
+
+# measured spectra to draw over the curves: CSVs of wavelength_um,intensity (same units as the plot), any size
+# each is converted once into .spectra_cache/ and drawn at about two points per pixel, redone when you zoom
+overlay_spectra = []  # e.g. ['spectrometer_run1.csv']
+
+if adaptive_sampling:
+    wavelengths = adaptive_wavelengths(temperatures, max_wavelength, np.geomspace(h_min, h_max, 12),
+                                       tolerance=sampling_tolerance)
+    print(f"Adaptive sampling: {len(wavelengths)} wavelength points")
+
+# All temperature curves come from one grid; the h-independent terms are computed once here
+planck_grid = PlanckGrid(wavelengths, temperatures, scale=1e-6)
+intensity_buffer = np.empty(planck_grid.shape)  # reused on every slider move
+
+if use_lookup_surface:
+    surface_mb = surface_nbytes(planck_grid, surface_samples) / 2**20
+    if surface_mb > max_surface_mb:
+        print(f"Radiance surface would be {surface_mb:.0f} MB (max_surface_mb = {max_surface_mb}), "
+              f"computing the curves on every slider move instead")
+        use_lookup_surface = False
+
+if use_lookup_surface:
+    radiance_surface = RadianceSurface(planck_grid, h_min, h_max, samples=surface_samples)
+    intensity_buffer = radiance_surface.new_buffer()
+    print(f"{'Loaded' if radiance_surface.loaded_from_cache else 'Built'} radiance surface {radiance_surface.path}")
 
 
 # Create the figure and axis
@@ -52,29 +89,25 @@ if set_x_limits:
 classical_intensities = I_classical(wavelengths, 5000)
 ax.plot(wavelengths*1e6, classical_intensities*1e-6, '--', label='Classical 5000K', color='red')
 
-# Save classical curve data
-classical_data = np.column_stack((wavelengths*1e6, classical_intensities*1e-6))
+# Save classical curve data; Rayleigh-Jeans has no finite value at λ = 0, so that sample is left out
+classical_valid = wavelengths > 0
+classical_data = np.column_stack((wavelengths[classical_valid]*1e6, classical_intensities[classical_valid]*1e-6))
 np.savetxt('classical_5000K.csv', classical_data, delimiter=',', 
            header='wavelength_um,intensity_MW_sr-1_m-2_nm-1', comments='')
 
-for temp in temperatures:
-    intensities = []
-    for wavelength in wavelengths:
-        intensity = I(wavelength, temp, h_actual)
-        intensities.append(intensity)
-    intensities = np.array(intensities)
-    line, = ax.plot(wavelengths*1e6, intensities*1e-6, label=f"{temp} K")
+for temp, intensities in zip(temperatures, planck_grid.radiance(1.0)):
+    line, = ax.plot(wavelengths*1e6, intensities, label=f"{temp} K")
     lines.append(line)
     
     # Save data for each temperature
-    data = np.column_stack((wavelengths*1e6, intensities*1e-6))
+    data = np.column_stack((wavelengths*1e6, intensities))
     np.savetxt(f'blackbody_{temp}K.csv', data, delimiter=',',
                header='wavelength_um,intensity_MW_sr-1_m-2_nm-1', comments='')
 
 # Add "experimental data points" (using actual Planck's constant)
 # Let's add fewer points to make it look like actual measurements
 experimental_wavelengths = np.linspace(0.1e-6, 5e-6, 50)  # 20 "measurement" points
-experimental_intensities = I(experimental_wavelengths, 5000, h_actual)  # Using 5000K as our "experiment"
+experimental_intensities = I(experimental_wavelengths, experimental_temperature, h_actual)  # Using 5000K as our "experiment"
 
 # Save experimental data points
 exp_data = np.column_stack((experimental_wavelengths*1e6, experimental_intensities*1e-6))
@@ -83,9 +116,13 @@ np.savetxt('experimental_data.csv', exp_data, delimiter=',',
 
 # Add experimental data points plot
 ax.scatter(experimental_wavelengths*1e6, experimental_intensities*1e-6, 
-          color='black', marker='o', label='5000K Experimental Data', 
+          color='black', marker='o', label=f'{experimental_temperature}K Experimental Data', 
           zorder=3, s=50)  # zorder=3 to ensure points are on top
 
+# Measured spectra; keep the objects, they redo their points on zoom
+overlays = [DecimatedSpectrum(ax, load_spectrum(path), lw=0.8, alpha=0.7, label=os.path.basename(path))
+            for path in overlay_spectra]
+
 ax.set_xlabel('Wavelength (μm)')
 ax.set_ylabel('Spectral Radiance (MW⋅sr⁻¹⋅m⁻²⋅nm⁻¹)')
 ax.set_title(f'Blackbody Radiation (h = {h_actual:.2e} J⋅s)')
@@ -102,36 +139,56 @@ h_slider = Slider(
     valinit=1.0
 )
 
+fps_counter = FPSCounter()
+fps_text = fig.text(0.01, 0.01, '', fontsize=9, color='gray', visible=show_fps)
+
+if use_blitting:
+    # Axes, grid, legend, classical curve and experimental points are cached as a background image
+    blit_manager = BlitManager(fig.canvas, lines + [ax.title, ax_slider, fps_text])
+    h_slider.drawon = False  # the slider would otherwise request a full redraw itself
+else:
+    # draw_idle() renders later, so count frames when they are actually drawn
+    fig.canvas.mpl_connect('draw_event', lambda event: fps_counter.frame())
+
+if show_fps:
+    fig.canvas.mpl_connect('close_event', lambda event: print(fps_counter.summary()))
+
 # Update function for the slider
 def update(val):
+    fps_counter.start()
     h = h_actual * val
-    for temp, line in zip(temperatures, lines):
-        intensities = []
-        for wavelength in wavelengths:
-            intensity = I(wavelength, temp, h)
-            intensities.append(intensity)
-        intensities = np.array(intensities)
-        line.set_ydata(intensities*1e-6)
+    if use_lookup_surface:
+        radiance_surface.radiance(val, out=intensity_buffer)
+    else:
+        planck_grid.radiance(val, out=intensity_buffer)
+    for intensities, line in zip(intensity_buffer, lines):
+        line.set_ydata(intensities)
     
-    ax.set_title(f'Blackbody Radiation (h = {h:.2e} J⋅s)\nFit quality: {abs(1-val):.3f} error')
-    fig.canvas.draw_idle()
+    # Fit quality is the RMS distance between the model at this h and the experimental points
+    model = I(experimental_wavelengths, experimental_temperature, h)
+    rms = np.sqrt(np.mean((model - experimental_intensities)**2)) * 1e-6
+    ax.set_title(f'Blackbody Radiation (h = {h:.2e} J⋅s)\nFit quality: RMS residual {rms:.3g} MW⋅sr⁻¹⋅m⁻²⋅nm⁻¹')
+    fps_text.set_text(fps_counter.label())
+    if use_blitting:
+        blit_manager.update()
+        fps_counter.frame()
+    else:
+        fig.canvas.draw_idle()
 
 # Save function for keyboard shortcut
 def save_current_state(event):
     if event.key == 's':
-        h = h_actual * h_slider.val
-        for temp, line in zip(temperatures, lines):
-            intensities = []
-            for wavelength in wavelengths:
-                intensity = I(wavelength, temp, h)
-                intensities.append(intensity)
-            intensities = np.array(intensities)
-            
+        for temp, intensities in zip(temperatures, planck_grid.radiance(h_slider.val)):
             # Save data for each temperature at current h value
-            data = np.column_stack((wavelengths*1e6, intensities*1e-6))
+            data = np.column_stack((wavelengths*1e6, intensities))
             np.savetxt(f'{h_slider.val:.3f}_blackbody_{temp}K.csv', data, delimiter=',',
                        header='wavelength_um,intensity_MW_sr-1_m-2_nm-1', comments='')
         print(f"Saved curves for h multiplier = {h_slider.val:.3f}")
+    elif event.key == 'b':
+        result = fit_spectra(experimental_wavelengths*1e6, experimental_intensities*1e-6, experimental_temperature)
+        print(f"Best fit: h = {result['h'][0]:.6e} ± {result['h_err'][0]:.1e} J⋅s "
+              f"(multiplier {result['h_multiplier'][0]:.4f}), residual RMS {result['rms'][0]:.3g}")
+        h_slider.set_val(np.clip(result['h_multiplier'][0], h_min, h_max))
 
 h_slider.on_changed(update)
 fig.canvas.mpl_connect('key_press_event', save_current_state)
@@ -0,0 +1,63 @@
+import numpy as np
+
+# Vectorized Planck radiance used by main.py.
+# Everything works on whole NumPy arrays at once instead of looping over wavelengths.
+
+c = 299792458 # speed of light (m/s)
+k_B = 1.380649e-23 # Boltzmann constant (J/K)
+h_actual = 6.62607015e-34 # Actual Planck constant (J*s)
+WIEN_X = 4.965114231744276 # Wien's displacement law: the peak sits where hc/(λk_BT) ≈ 4.965
+
+
+def I(lambdaa, temperature, h):
+    # temperature in Kelvin
+    # Returns spectral radiance in W⋅sr⁻¹⋅m⁻²⋅m⁻¹
+    # expm1 keeps precision where hc/λkT is small, and λ = 0 gets its limit of 0 instead of nan
+    lambdaa = np.asarray(lambdaa, dtype=float)
+    valid = lambdaa > 0
+    safe_lambda = np.where(valid, lambdaa, 1.0)
+    with np.errstate(over='ignore'):
+        radiance = (2*h*c**2)/(safe_lambda**5) / np.expm1((h*c)/(safe_lambda*k_B*temperature))
+    return np.where(valid, radiance, 0.0)
+
+
+def I_classical(lambdaa, temperature):
+    # Rayleigh-Jeans law; it diverges at λ = 0, which comes out as nan rather than inf (main.py doesn't export it)
+    lambdaa = np.asarray(lambdaa, dtype=float)
+    valid = lambdaa > 0
+    safe_lambda = np.where(valid, lambdaa, 1.0)
+    return np.where(valid, (2*c*k_B*temperature)/(safe_lambda**4), np.nan)
+
+
+class PlanckGrid:
+    """
+    Radiance over a full temperature × wavelength grid for any value of h.
+
+    hc/(λk_BT) and 2c²/λ⁵ don't depend on the h multiplier, so they are computed
+    once here and every call to radiance() is a single broadcast expm1 and divide.
+    """
+
+    def __init__(self, wavelengths, temperatures, scale=1.0):
+        self.wavelengths = np.asarray(wavelengths, dtype=float)
+        self.temperatures = np.asarray(temperatures, dtype=float)
+        self.scale = scale  # e.g. 1e-6 to get MW⋅sr⁻¹⋅m⁻²⋅nm⁻¹ for plotting
+
+        valid = self.wavelengths > 0
+        safe_lambda = np.where(valid, self.wavelengths, 1.0)
+        # Zero prefactor at λ = 0 makes those points come out as exactly 0
+        self.prefactor = np.where(valid, 2*c**2/safe_lambda**5, 0.0) * scale
+        # hc/(λk_BT) at the actual Planck constant, shape (temperatures, wavelengths)
+        self.x_actual = (h_actual*c) / (safe_lambda[np.newaxis, :]*k_B*self.temperatures[:, np.newaxis])
+
+    @property
+    def shape(self):
+        return self.x_actual.shape
+
+    def radiance(self, h_multiplier=1.0, out=None):
+        """Radiance for h = h_multiplier * h_actual, shape (temperatures, wavelengths)."""
+        h = h_actual * h_multiplier
+        out = np.multiply(self.x_actual, h_multiplier, out=out)
+        with np.errstate(over='ignore'):
+            np.expm1(out, out=out)
+        # exp overflow gives inf, and prefactor / inf is the correct 0
+        return np.divide(self.prefactor * h, out, out=out)
@@ -0,0 +1,66 @@
+import numpy as np
+
+from planck import c, k_B, h_actual, WIEN_X, I
+
+# Non-uniform wavelength grids for the blackbody curves.
+#
+# A uniform linspace spends most of its points on the long flat tail and on the
+# region below the peak where the radiance is ~1e-200, and can still be coarse
+# around the Wien peak. adaptive_wavelengths() starts from a coarse grid and keeps
+# bisecting only the intervals where drawing a straight line between the two end
+# points misses the true curve at the midpoint by more than tolerance × that
+# curve's peak. The result is one grid shared by every temperature (and every h
+# multiplier passed in), so it can be used anywhere the linspace was: PlanckGrid,
+# the lookup surface, the CSV exports and the sweep.
+
+
+def peak_wavelength(temperature, h_multiplier=1.0):
+    return h_multiplier*h_actual*c / (WIEN_X*k_B*np.asarray(temperature, dtype=float))
+
+
+def adaptive_wavelengths(temperatures, max_wavelength, h_multipliers=(1.0,), tolerance=1e-3,
+                         initial_points=33, max_points=100000):
+    """
+    Wavelength grid (m) on [0, max_wavelength] where linear interpolation between
+    neighbouring points stays within tolerance × peak radiance for every
+    temperature and h multiplier.
+
+    For a slider, pass a handful of h multipliers spread over its range, e.g.
+    np.geomspace(h_min, h_max, 12); the curves change smoothly in between.
+    """
+    T, h_multiplier = np.meshgrid(np.asarray(temperatures, dtype=float),
+                                  np.asarray(h_multipliers, dtype=float))
+    T = T.reshape(-1, 1)
+    h = (h_multiplier * h_actual).reshape(-1, 1)
+
+    def radiance(wavelengths):
+        return I(wavelengths[np.newaxis, :], T, h)
+
+    # Seed the narrowest peak so it can't hide between two coarse points; wider ones get found by bisection
+    peaks = np.minimum(peak_wavelength(T, h / h_actual), max_wavelength).ravel()
+    wavelengths = np.union1d(np.linspace(0, max_wavelength, initial_points), peaks.min())
+    values = radiance(wavelengths)
+    peak_values = np.maximum(I(peaks, T.ravel(), h.ravel()), values.max(axis=1))[:, np.newaxis]
+
+    while len(wavelengths) < max_points:
+        midpoints = (wavelengths[:-1] + wavelengths[1:]) / 2
+        midpoint_values = radiance(midpoints)
+        error = np.abs(midpoint_values - (values[:, :-1] + values[:, 1:]) / 2) / peak_values
+        refine = np.nonzero((error > tolerance).any(axis=0))[0]
+        if not len(refine):
+            break
+        refine = refine[:max_points - len(wavelengths)]
+        wavelengths = np.insert(wavelengths, refine + 1, midpoints[refine])
+        values = np.insert(values, refine + 1, midpoint_values[:, refine], axis=1)
+    return wavelengths
+
+
+def interpolation_error(wavelengths, temperatures, h_multiplier=1.0, reference_points=200001):
+    """Worst linear-interpolation error over all temperatures, relative to each curve's peak."""
+    dense = np.linspace(wavelengths[0], wavelengths[-1], reference_points)
+    worst = 0.0
+    for temperature in temperatures:
+        exact = I(dense, temperature, h_multiplier*h_actual)
+        interpolated = np.interp(dense, wavelengths, I(wavelengths, temperature, h_multiplier*h_actual))
+        worst = max(worst, np.max(np.abs(interpolated - exact)) / np.max(exact))
+    return worst
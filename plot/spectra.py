@@ -0,0 +1,172 @@
+"""
+Large measured spectra (spectrometer exports) to overlay on the blackbody plot.
+
+    python spectra.py measured.csv   # convert once and print what's in it
+
+A CSV in the format main.py writes (wavelength_um, intensity in MW⋅sr⁻¹⋅m⁻²⋅nm⁻¹,
+optional header) can have millions of rows. load_spectrum() parses it once, in
+chunks, into an .npy file in .spectra_cache/ (wavelength and intensity rows,
+sorted by wavelength, non-finite rows dropped) and memory-maps that back, so a
+later launch reads nothing until something is drawn and never holds the whole
+file in memory.
+
+DecimatedSpectrum draws it with about two points per horizontal pixel of the
+axes: the visible range is split into one column per pixel and only the lowest
+and highest point of every column is kept, in their original order. Peaks,
+dips and noise bands look the same as with every point drawn. The view is
+recomputed for the visible range when the axes are zoomed, panned or resized.
+"""
+import argparse
+import hashlib
+import itertools
+import os
+import time
+import warnings
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(HERE, '.spectra_cache')
+CACHE_VERSION = 1  # bump if the cache layout changes
+CHUNK_ROWS = 1_000_000  # CSV rows parsed (and cache rows copied) at a time
+BLOCK_POINTS = 4_000_000  # points read from the cache at a time while decimating
+
+
+def spectrum_key(csv_path, dtype):
+    stat = os.stat(csv_path)
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_VERSION}|{os.path.abspath(csv_path)}|{stat.st_size}|{stat.st_mtime_ns}|"
+                  f"{np.dtype(dtype).str}".encode())
+    return digest.hexdigest()[:16]
+
+
+def _is_header(line):
+    try:
+        float(line.split(',')[0])
+        return False
+    except ValueError:
+        return True
+
+
+def convert_csv(csv_path, npy_path, dtype=np.float32):
+    """Write the spectrum in csv_path to npy_path as a (2, points) array sorted by wavelength."""
+    # Parse chunk by chunk into a flat temporary file, since the row count isn't known up front
+    raw_path = f"{npy_path}.tmp.raw"
+    tmp_path = f"{npy_path}.tmp.npy"
+    count = 0
+    is_sorted = True
+    last_wavelength = -np.inf
+    with open(csv_path, encoding='utf-8') as f, open(raw_path, 'wb') as raw:
+        first_line = f.readline()
+        lines = f if _is_header(first_line) else itertools.chain([first_line], f)
+        while True:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)  # "input contained no data" at the end
+                rows = np.loadtxt(itertools.islice(lines, CHUNK_ROWS), delimiter=',', usecols=(0, 1), ndmin=2)
+            if len(rows) == 0:
+                break
+            rows = rows[np.isfinite(rows).all(axis=1)]
+            if len(rows) == 0:
+                continue
+            is_sorted &= rows[0, 0] >= last_wavelength and bool(np.all(np.diff(rows[:, 0]) >= 0))
+            last_wavelength = rows[-1, 0]
+            rows.astype(dtype).tofile(raw)
+            count += len(rows)
+
+    # Copy into the final layout, one contiguous row per column, so decimation reads
+    # only intensities and lookups only wavelengths
+    rows = np.memmap(raw_path, dtype=dtype, mode='r', shape=(count, 2)) if count else np.empty((0, 2), dtype)
+    order = None if is_sorted else np.argsort(rows[:, 0], kind='stable')
+    spectrum = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=(2, count))
+    for start in range(0, count, CHUNK_ROWS):
+        stop = min(start + CHUNK_ROWS, count)
+        block = rows[start:stop] if order is None else rows[order[start:stop]]
+        spectrum[0, start:stop] = block[:, 0]
+        spectrum[1, start:stop] = block[:, 1]
+    spectrum.flush()
+    del spectrum, rows
+    os.remove(raw_path)
+    # Renamed only once complete, so an interrupted conversion never looks like a valid cache
+    os.replace(tmp_path, npy_path)
+
+
+def load_spectrum(csv_path, dtype=np.float32, cache_dir=DEFAULT_CACHE_DIR):
+    """Memory-mapped (2, points) array of wavelengths (μm) and intensities, converting the CSV on first use."""
+    os.makedirs(cache_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    npy_path = os.path.join(cache_dir, f"{name}_{spectrum_key(csv_path, dtype)}.npy")
+    if not os.path.exists(npy_path):
+        convert_csv(csv_path, npy_path, dtype)
+    return np.load(npy_path, mmap_mode='r')
+
+
+def minmax_decimate(x, y, x_min, x_max, columns):
+    """
+    Indices of the points to draw for x between x_min and x_max at `columns` pixel columns.
+
+    x must be sorted. Keeps the lowest and highest y of every column (in their
+    original order) plus one point beyond each end of the range, so the line
+    runs to the edges of the axes. Short ranges are returned in full.
+    """
+    # Limits in x's own dtype, otherwise searchsorted converts all of x to float64 first
+    start = max(int(np.searchsorted(x, x.dtype.type(x_min), side='left')) - 1, 0)
+    stop = min(int(np.searchsorted(x, x.dtype.type(x_max), side='right')) + 1, len(x))
+    n = stop - start
+    if n <= 2 * columns:
+        return np.arange(start, stop)
+
+    width = -(-n // columns)  # points per column, rounded up
+    block = width * max(1, BLOCK_POINTS // width)  # whole columns, read from the memmap at once
+    indices = []
+    for block_start in range(start, stop, block):
+        values = np.asarray(y[block_start:min(block_start + block, stop)])
+        full = len(values) // width * width
+        if full:
+            grouped = values[:full].reshape(-1, width)
+            pairs = np.sort(np.stack([grouped.argmin(axis=1), grouped.argmax(axis=1)], axis=1), axis=1)
+            indices.append((pairs + block_start + width * np.arange(len(grouped))[:, np.newaxis]).ravel())
+        if full < len(values):
+            # The last, narrower column
+            rest = values[full:]
+            indices.append(np.sort([rest.argmin(), rest.argmax()]) + block_start + full)
+    return np.concatenate(indices)
+
+
+class DecimatedSpectrum:
+    """
+    A line on ax showing a (2, points) spectrum at about two points per pixel column.
+
+    Keep a reference to it: matplotlib only holds weak references to the
+    callbacks that redo the view on zoom, pan and resize.
+    """
+
+    def __init__(self, ax, spectrum, **line_kwargs):
+        self.ax = ax
+        self.wavelengths, self.intensities = spectrum[0], spectrum[1]
+        # The first view covers the whole spectrum, so autoscaling includes all of it
+        x_range = (self.wavelengths[0], self.wavelengths[-1]) if len(self.wavelengths) else (0, 0)
+        self.line, = ax.plot(*self.view(*x_range), **line_kwargs)
+        self.cids = [ax.callbacks.connect('xlim_changed', self.update),
+                     ax.figure.canvas.mpl_connect('resize_event', self.update)]
+
+    def view(self, x_min, x_max):
+        columns = max(int(self.ax.get_window_extent().width), 1)
+        indices = minmax_decimate(self.wavelengths, self.intensities, x_min, x_max, columns)
+        return self.wavelengths[indices], self.intensities[indices]
+
+    def update(self, *args):
+        self.line.set_data(*self.view(*sorted(self.ax.get_xlim())))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert spectrum CSVs to the memory-mapped cache")
+    parser.add_argument('spectra', nargs='+')
+    args = parser.parse_args()
+
+    for path in args.spectra:
+        start = time.perf_counter()
+        spectrum = load_spectrum(path)
+        elapsed = time.perf_counter() - start
+        wavelengths = spectrum[0]
+        span = f"{wavelengths[0]:.4g}-{wavelengths[-1]:.4g} μm" if len(wavelengths) else "empty"
+        print(f"{path}: {spectrum.shape[1]} points, {span}, {spectrum.filename} ({elapsed:.2f}s)")
@@ -0,0 +1,82 @@
+import hashlib
+import os
+
+import numpy as np
+
+from planck import PlanckGrid
+
+# Precomputed radiance lookup surface for the h-multiplier slider.
+#
+# The surface holds PlanckGrid.radiance() at h multipliers spaced evenly in log(h)
+# between h_min and h_max, shape (h samples, temperatures, wavelengths). The peak
+# scales roughly like h⁻⁴, so log spacing keeps the interpolation error about the
+# same across the slider. It is stored as an .npy file named after a hash of
+# everything it depends on and memory-mapped back in, so a launch with the same
+# settings does no Planck evaluations at all. Slider moves interpolate linearly
+# (in log h) between the two neighbouring slices.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(HERE, '.radiance_cache')
+SURFACE_VERSION = 1  # bump if the way the surface is computed changes
+
+
+def surface_nbytes(grid, samples, dtype=np.float32):
+    """Size of the surface file for grid: samples × temperatures × wavelengths values."""
+    return samples * grid.shape[0] * grid.shape[1] * np.dtype(dtype).itemsize
+
+
+def surface_key(grid, h_min, h_max, samples, dtype):
+    digest = hashlib.sha256()
+    digest.update(f"v{SURFACE_VERSION}|{h_min!r}|{h_max!r}|{samples}|{np.dtype(dtype).str}|{grid.scale!r}".encode())
+    digest.update(np.ascontiguousarray(grid.wavelengths, dtype=float).tobytes())
+    digest.update(np.ascontiguousarray(grid.temperatures, dtype=float).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class RadianceSurface:
+    def __init__(self, grid: PlanckGrid, h_min, h_max, samples=256, dtype=np.float32,
+                 cache_dir=DEFAULT_CACHE_DIR):
+        self.grid = grid
+        self.h_min = h_min
+        self.h_max = h_max
+        self.samples = samples
+        self.log_h_min = np.log(h_min)
+        self.log_h_step = (np.log(h_max) - self.log_h_min) / (samples - 1)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"surface_{surface_key(grid, h_min, h_max, samples, dtype)}.npy")
+        self.loaded_from_cache = os.path.exists(self.path)
+        if not self.loaded_from_cache:
+            self._build(dtype)
+        self.values = np.load(self.path, mmap_mode='r')
+
+    def _build(self, dtype):
+        # Write to a temporary file first so an interrupted build never looks like a valid cache
+        tmp_path = f"{self.path}.tmp.npy"
+        shape = (self.samples,) + self.grid.shape
+        surface = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=shape)
+        buffer = np.empty(self.grid.shape)
+        for i, h_multiplier in enumerate(np.geomspace(self.h_min, self.h_max, self.samples)):
+            surface[i] = self.grid.radiance(h_multiplier, out=buffer)
+        surface.flush()
+        del surface
+        os.replace(tmp_path, self.path)
+
+    def new_buffer(self):
+        return np.empty(self.grid.shape, dtype=self.values.dtype)
+
+    def radiance(self, h_multiplier, out=None):
+        """Interpolated radiance for one h multiplier, shape (temperatures, wavelengths).
+
+        Pass a buffer from new_buffer() as `out` to avoid allocating on every slider move.
+        """
+        position = (np.log(np.clip(h_multiplier, self.h_min, self.h_max)) - self.log_h_min) / self.log_h_step
+        i = min(int(position), self.samples - 2)
+        weight = self.values.dtype.type(position - i)
+
+        # out = lower + weight * (upper - lower), without temporaries
+        lower, upper = self.values[i], self.values[i + 1]
+        out = np.subtract(upper, lower, out=out)
+        out *= weight
+        out += lower
+        return out
@@ -0,0 +1,140 @@
+"""
+Headless parameter sweep for the blackbody curves in main.py.
+
+Evaluates every (h multiplier, temperature) combination without opening a
+window and stores all curves in one compressed .npz file, instead of pressing
+'s' in the interactive plot for each value:
+
+    python sweep.py --temperatures 3000:6000:31 --h 0.5:1.5:101 --out sweep.npz
+    python sweep.py --temperatures 3000,4000,5000 --h 0.8:1.2:5 --csv-dir sweep_csv
+    python sweep.py --adaptive --tolerance 1e-3    # non-uniform wavelengths, far fewer points
+
+Load the result with load_sweep(). The radiance array has shape
+(h multipliers, temperatures, wavelengths) in MW⋅sr⁻¹⋅m⁻²⋅nm⁻¹, the same
+units as the CSVs written by main.py.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from planck import PlanckGrid, h_actual
+from sampling import adaptive_wavelengths, interpolation_error
+
+CSV_HEADER = 'wavelength_um,intensity_MW_sr-1_m-2_nm-1'
+
+
+def parse_values(text):
+    """'3000:6000:31' -> 31 evenly spaced values, '3000,4000' -> those values."""
+    if ':' in text:
+        start, stop, count = text.split(':')
+        return np.linspace(float(start), float(stop), int(count))
+    return np.array([float(v) for v in text.split(',')])
+
+
+def run_sweep(wavelengths, temperatures, h_multipliers, workers=None, chunk_size=16, dtype=np.float32):
+    """Radiance for every h multiplier and temperature, shape (h, temperatures, wavelengths)."""
+    grid = PlanckGrid(wavelengths, temperatures, scale=1e-6)
+    h_multipliers = np.asarray(h_multipliers, dtype=float)
+    radiance = np.empty((len(h_multipliers),) + grid.shape, dtype=dtype)
+
+    def evaluate(start):
+        # Each chunk writes straight into its slice of the result; NumPy releases
+        # the GIL inside expm1/divide, so plain threads run these in parallel
+        buffer = np.empty(grid.shape)
+        for i in range(start, min(start + chunk_size, len(h_multipliers))):
+            radiance[i] = grid.radiance(h_multipliers[i], out=buffer)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        list(executor.map(evaluate, range(0, len(h_multipliers), chunk_size)))
+    return radiance
+
+
+def save_sweep(path, wavelengths, temperatures, h_multipliers, radiance, **metadata):
+    metadata = {
+        'created': datetime.now().isoformat(),
+        'h_actual': h_actual,
+        'radiance_units': 'MW sr-1 m-2 nm-1',
+        'wavelength_units': 'um',
+        'shape': ['h_multiplier', 'temperature', 'wavelength'],
+        **metadata,
+    }
+    np.savez_compressed(
+        path,
+        radiance=radiance,
+        wavelengths_um=np.asarray(wavelengths) * 1e6,
+        temperatures=np.asarray(temperatures, dtype=float),
+        h_multipliers=np.asarray(h_multipliers, dtype=float),
+        metadata=np.array(json.dumps(metadata)),
+    )
+
+
+def load_sweep(path):
+    """Returns a dict with radiance, wavelengths_um, temperatures, h_multipliers and metadata."""
+    with np.load(path) as data:
+        result = {key: data[key] for key in data.files if key != 'metadata'}
+        result['metadata'] = json.loads(str(data['metadata']))
+    return result
+
+
+def export_csv(directory, wavelengths, temperatures, h_multipliers, radiance):
+    """One CSV per curve, named and formatted like the 's' key output of main.py."""
+    os.makedirs(directory, exist_ok=True)
+    wavelengths_um = np.asarray(wavelengths) * 1e6
+    for h_multiplier, curves in zip(h_multipliers, radiance):
+        for temp, intensities in zip(temperatures, curves):
+            data = np.column_stack((wavelengths_um, intensities))
+            np.savetxt(os.path.join(directory, f'{h_multiplier:.3f}_blackbody_{temp:g}K.csv'), data,
+                       delimiter=',', header=CSV_HEADER, comments='')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate blackbody curves over ranges of T and h")
+    parser.add_argument('--temperatures', default='3000,4000,5000',
+                        help="Kelvin, as start:stop:count or a comma separated list")
+    parser.add_argument('--h', default='0.1:2.0:96',
+                        help="h multipliers, as start:stop:count or a comma separated list")
+    parser.add_argument('--points', type=int, default=1000, help="wavelength samples per curve")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="place wavelengths where the curves bend instead of --points evenly spaced ones")
+    parser.add_argument('--tolerance', type=float, default=1e-3,
+                        help="with --adaptive: max linear interpolation error as a fraction of each curve's peak")
+    parser.add_argument('--max-wavelength', type=float, default=6e-6, help="in meters")
+    parser.add_argument('--out', default='sweep.npz')
+    parser.add_argument('--csv-dir', help="also write one CSV per curve into this directory")
+    parser.add_argument('--workers', type=int, help="parallel chunks (default: all cores)")
+    parser.add_argument('--float64', action='store_true', help="store radiance as float64 instead of float32")
+    args = parser.parse_args()
+
+    temperatures = parse_values(args.temperatures)
+    h_multipliers = parse_values(args.h)
+    if args.adaptive:
+        wavelengths = adaptive_wavelengths(temperatures, args.max_wavelength, h_multipliers, args.tolerance)
+        # Check the grid against a dense reference at a few h values, including both ends of the range
+        checked = np.asarray(h_multipliers)[np.unique(np.linspace(0, len(h_multipliers) - 1, 5).astype(int))]
+        error = max(interpolation_error(wavelengths, temperatures, h) for h in checked)
+        print(f"Adaptive sampling: {len(wavelengths)} wavelength points, worst interpolation error {error:.2g} "
+              f"of the peak (tolerance {args.tolerance:g}, checked at {len(checked)} h value"
+              f"{'' if len(checked) == 1 else 's'})")
+    else:
+        wavelengths = np.linspace(0, args.max_wavelength, args.points)
+        error = None
+    dtype = np.float64 if args.float64 else np.float32
+
+    start = time.perf_counter()
+    radiance = run_sweep(wavelengths, temperatures, h_multipliers, args.workers, dtype=dtype)
+    computed = time.perf_counter()
+    save_sweep(args.out, wavelengths, temperatures, h_multipliers, radiance,
+               points=len(wavelengths), max_wavelength_m=args.max_wavelength,
+               adaptive_tolerance=args.tolerance if args.adaptive else None, adaptive_error=error)
+    saved = time.perf_counter()
+    print(f"{radiance.shape[0] * radiance.shape[1]} curves x {radiance.shape[2]} points: "
+          f"computed in {computed - start:.2f}s, saved to {args.out} in {saved - computed:.2f}s")
+
+    if args.csv_dir:
+        export_csv(args.csv_dir, wavelengths, temperatures, h_multipliers, radiance)
+        print(f"Wrote CSVs to {args.csv_dir} in {time.perf_counter() - saved:.2f}s")
@@ -0,0 +1,185 @@
+"""
+Bulk reference generation from a Curius export (see scrape_curius/).
+
+Streams bookmark rows straight into the handlers from main.py instead of
+pasting URLs into the Streamlit app. URLs already present in references.csv
+are skipped, the bookmark's saved title stands in for the website LLM call,
+and every finished reference is appended to the output files right away, so
+an interrupted run can simply be started again. URLs that failed before are
+tried again; their old ERROR rows are removed first, so every URL has one row.
+
+    python bulk_ingest.py ../scrape_curius/curius_bookmarks.csv
+"""
+import argparse
+import csv
+import itertools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import main as app
+
+RESULT_FIELDS = ['source_type', 'title', 'author', 'date', 'source', 'original_url', 'short_url']
+
+
+def normalize_url(url):
+    """Key used to decide whether two URLs are the same reference."""
+    parsed = urlparse(url.strip())
+    path = parsed.path.rstrip('/')
+    query = f"?{parsed.query}" if parsed.query else ""
+    return f"{parsed.netloc.lower().removeprefix('www.')}{path}{query}"
+
+
+def load_previous_urls(references_csv):
+    """(resolved, failed) URL keys in references.csv; failed are those with nothing but ERROR rows."""
+    resolved, failed = set(), set()
+    try:
+        with open(references_csv, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row.get('original_url'):
+                    key = normalize_url(row['original_url'])
+                    (failed if row.get('source_type') == 'ERROR' else resolved).add(key)
+    except FileNotFoundError:
+        pass
+    return resolved, failed - resolved
+
+
+def drop_rows(csv_path, url_keys):
+    """Rewrite csv_path without the rows whose original_url is in url_keys."""
+    if not url_keys or not os.path.exists(csv_path):
+        return
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        rows = [row for row in reader if normalize_url(row.get('original_url') or '') not in url_keys]
+        fields = reader.fieldnames
+    with open(csv_path + '.tmp', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(csv_path + '.tmp', csv_path)
+
+
+def iter_new_bookmarks(bookmarks_csv, seen_urls):
+    """Yield (url, title) for bookmarks whose URL hasn't been resolved before."""
+    with open(bookmarks_csv, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            url = (row.get('url') or '').strip()
+            if not url:
+                continue
+            key = normalize_url(url)
+            if key in seen_urls:
+                continue
+            seen_urls.add(key)
+            yield url, (row.get('title') or '').strip()
+
+
+class ReferenceWriter:
+    """Appends results to references.csv, link_generation.csv and references.txt as they finish."""
+
+    def __init__(self, output_dir):
+        self._lock = threading.Lock()
+        self._files = []
+        self._references = self._open_csv(os.path.join(output_dir, 'references.csv'), RESULT_FIELDS)
+        self._links = self._open_csv(os.path.join(output_dir, 'link_generation.csv'),
+                                     ['original_url', 'short_url'])
+        self._text = self._open(os.path.join(output_dir, 'references.txt'), "References:\n\n")
+
+    def _open(self, path, header):
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        f = open(path, 'a', newline='', encoding='utf-8')
+        if is_new:
+            f.write(header)
+        self._files.append(f)
+        return f
+
+    def _open_csv(self, path, fields):
+        # Same line endings as the app's pandas exports, so appended rows match
+        f = self._open(path, ','.join(fields) + '\n')
+        return f, csv.DictWriter(f, fieldnames=fields, lineterminator='\n')
+
+    def write(self, result, reference_text):
+        short_url = result['short_url']
+        if short_url != 've42.co/error':
+            short_url = short_url.replace('ve42.co/', '')
+        with self._lock:
+            self._references[1].writerow({k: result.get(k, '') for k in RESULT_FIELDS})
+            self._links[1].writerow({'original_url': result['original_url'], 'short_url': short_url})
+            # A failure has no reference to list; it stays in the CSVs until a retry replaces it
+            if result['source_type'] != 'ERROR':
+                self._text.write(reference_text + "\n")
+            for f in self._files:
+                f.flush()
+
+    def close(self):
+        for f in self._files:
+            f.close()
+
+
+def resolve(url, title, use_title_hints=True, check=True):
+    try:
+        result = app.classify_url(url, title if use_title_hints else None)
+    except Exception as e:
+        result = app.error_result(url, e)
+    if result['source_type'] == 'ERROR':
+        return result, ""
+    return result, app.format_reference(result, check)
+
+
+def bulk_ingest(bookmarks_csv, output_dir='.', workers=8, use_title_hints=True, check=True, limit=None):
+    references_csv = os.path.join(output_dir, 'references.csv')
+    seen_urls, failed_urls = load_previous_urls(references_csv)
+    print(f"{len(seen_urls)} URLs already resolved in {references_csv}")
+
+    bookmarks = list(itertools.islice(iter_new_bookmarks(bookmarks_csv, set(seen_urls)), limit))
+    # The earlier failures being retried lose their ERROR rows; the new result takes their place
+    retried = {normalize_url(url) for url, title in bookmarks} & failed_urls
+    if retried:
+        print(f"Retrying {len(retried)} URLs that failed before")
+        drop_rows(references_csv, retried)
+        drop_rows(os.path.join(output_dir, 'link_generation.csv'), retried)
+
+    writer = ReferenceWriter(output_dir)
+    done = errors = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(resolve, url, title, use_title_hints, check): url for url, title in bookmarks}
+
+            for future in as_completed(futures):
+                result, reference_text = future.result()
+                writer.write(result, reference_text)
+                done += 1
+                if result['source_type'] == 'ERROR':
+                    errors += 1
+                    print(f"[{done}/{len(futures)}] ERROR {futures[future]}: {result['author']}")
+                else:
+                    print(f"[{done}/{len(futures)}] {result['source_type']}: {result['title']}")
+    finally:
+        writer.close()
+        # Keep the LLM log next to the outputs, like the app's download link
+        with open(os.path.join(output_dir, 'llm_responses.txt'), 'a', encoding='utf-8') as f:
+            f.write("".join(app.st.session_state.llm_responses))
+
+    print(f"\nResolved {done} new references ({errors} errors)")
+    return done
+
+
+if __name__ == "__main__":
+    # The handlers call st.* outside a Streamlit session; those calls are harmless here
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').setLevel(logging.ERROR)
+
+    parser = argparse.ArgumentParser(description="Generate references for every bookmark in a Curius export")
+    parser.add_argument('bookmarks', help="CSV from scrape_curius.py (title,url,timestamp,relative_time)")
+    parser.add_argument('--output-dir', default='.', help="where references.csv and friends live")
+    parser.add_argument('--workers', type=int, default=8, help="URLs resolved in parallel")
+    parser.add_argument('--no-title-hints', action='store_true',
+                        help="always fetch websites and ask the LLM, ignoring bookmark titles")
+    parser.add_argument('--no-final-check', action='store_true',
+                        help="skip the final formatting LLM pass over each reference")
+    parser.add_argument('--limit', type=int, help="only process this many new bookmarks")
+    args = parser.parse_args()
+
+    bulk_ingest(args.bookmarks, args.output_dir, args.workers,
+                use_title_hints=not args.no_title_hints, check=not args.no_final_check, limit=args.limit)
@@ -15,6 +15,15 @@ import io
 import time
 import streamlit as st
 import base64
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# youtube_cache.py lives with the YouTube scraper
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'yt scraper'))
+from youtube_cache import CachedYouTube
+from pipeline import Pipeline, Stage, format_stats
 
 # For local development
 try:
@@ -24,8 +33,11 @@ except:
 
 # For Streamlit Cloud - access secrets
 def get_api_key(key_name):
-    if key_name in st.secrets:
-        return st.secrets[key_name]
+    try:
+        if key_name in st.secrets:
+            return st.secrets[key_name]
+    except Exception:
+        pass  # No secrets.toml, e.g. when running locally from a .env file
     return os.getenv(key_name)  # Fallback to environment variable
 
 # Set up page configuration
@@ -60,14 +72,30 @@ def setup_youtube_api():
     if not API_KEY:
         st.error("YOUTUBE_API_KEY is not set in the environment variables. YouTube references won't work.")
         return None
-    return build('youtube', 'v3', developerKey=API_KEY)
+    # Wrapped so repeated lookups are answered by ETag and quota use is tracked
+    return CachedYouTube(build('youtube', 'v3', developerKey=API_KEY))
 
 youtube = setup_youtube_api()
 
-def classify_url(url:str)-> Optional[Dict]:
+def classify_url(url:str, title_hint:Optional[str]=None)-> Optional[Dict]:
     """
     Classify the URL into (youtube, pdf, doi, website) 
+    title_hint (e.g. a bookmark's saved title) lets website lookups skip the fetch and LLM call
     """
+    kind = source_type(url)
+    if kind == 'youtube':
+        return youtube_handler(url)
+    elif kind == 'pdf':
+        return pdf_handler(url)
+    elif kind == 'doi':
+        return doi_handler(url)
+    elif kind == 'wikipedia':
+        return wikipedia_handler(url)
+    else:
+        return website_handler(url, title_hint) # classifies into wikipedia, website or after
+
+def source_type(url:str) -> str:
+    """Which handler a URL goes to: youtube, pdf, doi, wikipedia or website"""
     parsed = urlparse(url)
     doi_pattern = r'(10\.\d{4,}/[-._;()/:\w]+)'
 
@@ -77,15 +105,15 @@ def classify_url(url:str)-> Optional[Dict]:
 
 
     if "youtube.com" in parsed.netloc or "youtu.be" in parsed.netloc:
-        return youtube_handler(url)
+        return 'youtube'
     elif is_pdf:
-        return pdf_handler(url)
+        return 'pdf'
     elif "doi.org" in parsed.netloc or re.search(doi_pattern,url):
-        return doi_handler(url)
+        return 'doi'
     elif is_wikipedia:
-        return wikipedia_handler(url)
+        return 'wikipedia'
     else:
-        return website_handler(url) # classifies into wikipedia, website or after
+        return 'website'
 
 def youtube_handler(url:str) -> Dict:
     # extracing video id    
@@ -207,14 +235,20 @@ def doi_handler(url: str) -> Dict:
     }
 
 def pdf_handler(url:str) -> Dict:
+    return pdf_result(url, message(pdf_prompt(fetch_pdf(url))))
+
+def fetch_pdf(url:str) -> bytes:
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
     }
     response = requests.get(url,headers=headers)
     if not response.ok:
         raise ValueError(f"Failed to download PDF: {response.status_code}")
+    return response.content
 
-    pdf_file = io.BytesIO(response.content)
+def pdf_prompt(content:bytes) -> str:
+    """LLM prompt asking for the metadata of a PDF, from the text of its first pages"""
+    pdf_file = io.BytesIO(content)
     pdf_reader = PdfReader(pdf_file)
     
     text_content = ""
@@ -250,7 +284,10 @@ def pdf_handler(url:str) -> Dict:
 
     Content: {text_content}
     """
-    parsed_data = parse_reference(message(prompt))
+    return prompt
+
+def pdf_result(url:str, answer:Optional[str]) -> Dict:
+    parsed_data = parse_reference(answer)
 
     if parsed_data is None:
         return {
@@ -285,8 +322,14 @@ def pdf_handler(url:str) -> Dict:
 
 def wikipedia_handler(url: str) -> Dict:
     """Special handler for Wikipedia articles"""
+    return wikipedia_result(url, fetch_wikipedia(url))
+
+def fetch_wikipedia(url: str) -> str:
     response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    return response.text
+
+def wikipedia_result(url: str, html_content: str) -> Dict:
+    soup = BeautifulSoup(html_content, 'html.parser')
     title = soup.find('h1', {'id': 'firstHeading'}).text
     
     url_ending = ''.join(c for c in title.lower() if c.isalnum())[:8]
@@ -322,13 +365,32 @@ def filter_content(html_content):
     
     return text_content.strip()
 
-def website_handler(url: str) -> Dict:
+def website_handler(url: str, title_hint: Optional[str] = None) -> Dict:
+    if title_hint:
+        # Website references only print the title and short url, so a known
+        # title makes fetching the page and asking the LLM unnecessary
+        url_ending = ''.join(c for c in title_hint.lower() if c.isalnum())[:8]
+        return {
+            'source_type': 'website',
+            'title': title_hint,
+            'author': 'NOT_FOUND',
+            'date': 'NOT_FOUND',
+            'source': 'NOT_FOUND',
+            'original_url': url,
+            'short_url': f"ve42.co/{url_ending}"
+        }
+    return website_result(url, message(website_prompt(fetch_website(url))))
+
+def fetch_website(url: str) -> str:
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
     }
     response = requests.get(url, headers=headers)
-    html_content = response.text
+    return response.text
+
+def website_prompt(html_content: str) -> str:
+    """LLM prompt asking for the metadata of a web page"""
     filtered_content = filter_content(html_content)
     soup = BeautifulSoup(filtered_content, 'html.parser')
     prompt = f"""Return ONLY a JSON object wrapped in ```json tags. The JSON must contain:
@@ -342,7 +404,9 @@ def website_handler(url: str) -> Dict:
     RESPOND WITH ONLY THE JSON AND NOTHING ELSE. If you don't find one of the fields, return NOT_FOUND as the value.
     
     Content: {soup.prettify()}"""
-    answer = message(prompt)
+    return prompt
+
+def website_result(url: str, answer: Optional[str]) -> Dict:
     print(answer)
     parsed_data = parse_reference(answer)
     
@@ -499,51 +563,207 @@ def final_check(text:str)->str:
         return text
  
 
-def format_references(results):
-    """Format references from results list into text."""
-    references_text = "References:\n\n"
-    
-    for row in results:
-        ref = "" 
-        if row['source_type'] == 'youtube':
-            ref = f"{row['author']}. {row['title']}. {row['original_url']}\n"
-        elif row['source_type'] == 'wikipedia':
-            ref = f"{row['title']}. {row['original_url']}\n"
-        elif row['source_type'] == 'website':
-            ref = f"{row['title']}. {row['short_url']}\n"
-        elif row['source_type'] == 'pdf' or row['source_type'] == 'doi':
-            ref = f"{row['author']} ({row['date']}). {row['title']}. {row['source']} - {row['short_url']}\n"
-
-        ref = final_check(ref)
-        references_text += ref + "\n"
-    
-    return references_text
+def format_reference(row, check=True):
+    """Format a single result row into a reference line, cleaned up by final_check unless check=False."""
+    ref = "" 
+    if row['source_type'] == 'youtube':
+        ref = f"{row['author']}. {row['title']}. {row['original_url']}\n"
+    elif row['source_type'] == 'wikipedia':
+        ref = f"{row['title']}. {row['original_url']}\n"
+    elif row['source_type'] == 'website':
+        ref = f"{row['title']}. {row['short_url']}\n"
+    elif row['source_type'] == 'pdf' or row['source_type'] == 'doi':
+        ref = f"{row['author']} ({row['date']}). {row['title']}. {row['source']} - {row['short_url']}\n"
+
+    return final_check(ref) if check else ref
+
+def join_references(references):
+    """Formatted references (from format_reference) as the text of the references file."""
+    return "References:\n\n" + "".join(reference + "\n" for reference in references)
+
+def error_result(url, error):
+    """Result row recorded for a URL whose handler raised."""
+    return {
+        'source_type': 'ERROR',
+        'title': 'ERROR',
+        'author': str(error),
+        'date': '',
+        'source': '',
+        'original_url': url,
+        'short_url': ''
+    }
 
-def process_urls(urls):
-    """Process a list of URLs and return results."""
-    results = []
+# ----------------------------------------------------------------------------
+# Staged processing: every URL goes through these stages one after the other,
+# but different URLs are in different stages at the same time (see pipeline.py).
+# Each stage only does its part when the item still needs it, e.g. YouTube and
+# DOI lookups are finished after the fetch, and errors skip straight to format.
+# ----------------------------------------------------------------------------
+
+def fetch_stage(item):
+    url = item['url']
+    item['kind'] = source_type(url)
+    if item['kind'] == 'youtube':
+        item['result'] = youtube_handler(url)
+    elif item['kind'] == 'doi':
+        item['result'] = doi_handler(url)
+    elif item['kind'] == 'pdf':
+        item['content'] = fetch_pdf(url)
+    elif item['kind'] == 'wikipedia':
+        item['content'] = fetch_wikipedia(url)
+    else:
+        item['content'] = fetch_website(url)
+    return item
+
+def parse_stage(item):
+    if item['result'] is None:
+        if item['kind'] == 'wikipedia':
+            item['result'] = wikipedia_result(item['url'], item['content'])
+        elif item['kind'] == 'pdf':
+            item['prompt'] = pdf_prompt(item['content'])
+        else:
+            item['prompt'] = website_prompt(item['content'])
+    item['content'] = None  # don't hold on to pages and PDFs for the rest of the pipeline
+    return item
+
+def metadata_stage(item):
+    if item['result'] is None:
+        answer = message(item['prompt'])
+        if item['kind'] == 'pdf':
+            item['result'] = pdf_result(item['url'], answer)
+        else:
+            item['result'] = website_result(item['url'], answer)
+    return item
+
+def format_stage(item):
+    item['reference'] = format_reference(item['result'], check=False)
+    return item
+
+def final_check_stage(item):
+    item['reference'] = final_check(item['reference'])
+    return item
+
+def new_item(index, url):
+    return {'index': index, 'url': url, 'kind': None, 'content': None, 'prompt': None, 'result': None,
+            'reference': None, 'error': None}
+
+def stage_failed(item, stage_name, error):
+    """A URL that fails becomes an error row, which the later stages format like any other."""
+    item['error'] = error
+    item['result'] = error_result(item['url'], error)
+    if stage_name in ('format', 'final_check'):
+        item['reference'] = format_reference(item['result'], check=False)
+    return item
+
+def process_references(urls):
+    """
+    Resolve and format every URL through the staged pipeline.
+    Returns (results, references_text, stats) with results in the order of urls.
+    """
+    ctx = get_script_run_ctx()
+    pipeline = Pipeline([
+        Stage('classify/fetch', fetch_stage, workers=8),
+        Stage('parse', parse_stage, workers=2),
+        Stage('metadata LLM', metadata_stage, workers=4),
+        Stage('format', format_stage, workers=1),
+        Stage('final_check', final_check_stage, workers=4),
+    ], on_error=stage_failed,
+        # Stage threads share this session's script context, so update_llm_log and st.error work there
+        initializer=lambda: add_script_run_ctx(None, ctx))
+
+    items = [new_item(i, url) for i, url in enumerate(urls)]
     progress_bar = st.progress(0)
-    
-    for i, url in enumerate(urls):
+    for done, item in enumerate(pipeline.run(items), 1):
+        if item['error'] is not None:
+            st.error(f"Error processing {item['url']}: {item['error']}")
+        progress_bar.progress(done / len(items))
+
+    results = [item['result'] for item in items]
+    return results, join_references(item['reference'] for item in items), pipeline.stats()
+
+RESOLVE_STAGES = [('classify/fetch', fetch_stage), ('parse', parse_stage), ('metadata LLM', metadata_stage),
+                  ('format', format_stage), ('final_check', final_check_stage)]
+
+def resolve_url(url, cancelled=None):
+    """
+    Run one URL through the pipeline's stages in this thread; returns the finished item.
+    Once the threading.Event `cancelled` is set, it stops before the next stage (and so
+    before any LLM call still to come) and returns None.
+    """
+    item = new_item(0, url)
+    for stage_name, stage in RESOLVE_STAGES:
+        if cancelled is not None and cancelled.is_set():
+            return None
         try:
-            st.write(f"Processing: {url}")
-            result = classify_url(url)
-            results.append(result)
-            # Update progress
-            progress_bar.progress((i + 1) / len(urls))
+            item = stage(item)
         except Exception as e:
-            st.error(f"Error processing {url}: {e}")
-            results.append({
-                'source_type': 'ERROR',
-                'title': 'ERROR',
-                'author': str(e),
-                'date': '',
-                'source': '',
-                'original_url': url,
-                'short_url': ''
-            })
-    
-    return results
+            item = stage_failed(item, stage_name, e)
+    return item
+
+class SpeculativeResolver:
+    """
+    Resolves URLs in background threads while the list is still being edited.
+
+    Kept in st.session_state, so every browser session has its own threads and
+    results. sync() gets the URLs currently in the text area on each rerun: new
+    ones are submitted, removed ones are cancelled, or if already running, stopped
+    before their next stage, so a removed URL costs at most the stage it is in (one
+    fetch or one LLM call). collect() returns what has finished and waits for the rest.
+    """
+
+    def __init__(self, workers=4):
+        # Workers share this session's script context, so update_llm_log and
+        # st.error calls inside the handlers still reach the session
+        self._executor = ThreadPoolExecutor(max_workers=workers, initializer=add_script_run_ctx,
+                                            initargs=(None, get_script_run_ctx()))
+        self._futures = {}
+        self._cancelled = {}
+
+    def sync(self, urls):
+        wanted = set(urls)
+        for url in list(self._futures):
+            if url not in wanted:
+                self._cancelled.pop(url).set()
+                self._futures.pop(url).cancel()
+        for url in urls:
+            if url not in self._futures:
+                self._cancelled[url] = threading.Event()
+                self._futures[url] = self._executor.submit(resolve_url, url, self._cancelled[url])
+
+    def counts(self):
+        """(finished, total) for the URLs currently submitted."""
+        return sum(future.done() for future in self._futures.values()), len(self._futures)
+
+    def collect(self, urls):
+        """Finished items (see resolve_url) in the order of urls; failures are shown with st.error."""
+        self.sync(urls)
+        futures = [self._futures[url] for url in urls]
+        finished = sum(future.done() for future in futures)
+        progress_bar = st.progress(finished / len(futures))
+        for future in as_completed([future for future in futures if not future.done()]):
+            finished += 1
+            progress_bar.progress(finished / len(futures))
+        items = [future.result() for future in futures]
+        for item in items:
+            if item['error'] is not None:
+                st.error(f"Error processing {item['url']}: {item['error']}")
+        return items
+
+    def close(self):
+        for cancelled in self._cancelled.values():
+            cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._futures = {}
+        self._cancelled = {}
+
+@st.fragment(run_every=1)
+def show_speculative_status():
+    finished, total = st.session_state.resolver.counts()
+    if total:
+        st.caption(f"Resolved {finished} of {total} URLs in the background")
+
+def parse_urls(text):
+    return [url.strip() for url in text.split('\n') if url.strip()]
 
 def get_download_link(df, filename, text):
     """Generates a link to download the dataframe as a CSV file."""
@@ -564,19 +784,39 @@ def main():
     
     # Input area for URLs
     urls_input = st.text_area("Enter URLs (one per line):", height=200)
+
+    # Opt-in: start resolving URLs as soon as they are in the text area (it updates
+    # when it loses focus or on Ctrl+Enter), so the fetches and LLM calls overlap
+    # with editing the rest of the list
+    speculative = st.toggle("Resolve URLs in the background while editing",
+                            help="Starts fetching and formatting each URL as soon as it is entered. "
+                                 "Removing a URL cancels its lookup.")
+    if speculative:
+        if 'resolver' not in st.session_state:
+            st.session_state.resolver = SpeculativeResolver()
+        st.session_state.resolver.sync(parse_urls(urls_input))
+        show_speculative_status()
+    elif 'resolver' in st.session_state:
+        st.session_state.pop('resolver').close()
     
     # Process button
     if st.button("Process URLs"):
         if not urls_input.strip():
             st.warning("Please enter at least one URL.")
         else:
-            urls = [url.strip() for url in urls_input.split('\n') if url.strip()]
+            urls = parse_urls(urls_input)
             
             with st.spinner("Processing URLs..."):
-                st.session_state.results = process_urls(urls)
-                
-                # Format references
-                st.session_state.references_text = format_references(st.session_state.results)
+                if speculative:
+                    # Most of these were already resolved while the list was being edited
+                    items = st.session_state.resolver.collect(urls)
+                    st.session_state.results = [item['result'] for item in items]
+                    st.session_state.references_text = join_references(item['reference'] for item in items)
+                    st.session_state.pipeline_stats = None
+                else:
+                    # Fetching, LLM metadata and final_check of different URLs overlap
+                    (st.session_state.results, st.session_state.references_text,
+                     st.session_state.pipeline_stats) = process_references(urls)
                 
                 # Mark as processed
                 st.session_state.processed = True
@@ -610,6 +850,11 @@ def main():
         
         st.markdown(get_text_download_link(st.session_state.references_text, "references.txt", "Download References Text"), unsafe_allow_html=True)
         
+        # How busy each processing stage was, to see which one limits the run
+        if st.session_state.get('pipeline_stats'):
+            with st.expander("View Pipeline Stats"):
+                st.text(format_stats(st.session_state.pipeline_stats))
+        
         # Display LLM API logs if expanded
         with st.expander("View LLM API Logs"):
             st.text("".join(st.session_state.llm_responses))
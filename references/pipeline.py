@@ -0,0 +1,152 @@
+"""
+Staged pipeline with bounded queues between the stages, used by main.py.
+
+Every stage has its own worker threads and reads from a bounded queue that the
+stage before it fills, so an item moves on as soon as its stage is done with it
+and the slow stages (LLM calls) overlap with each other and with the fetches.
+The bounds keep a fast stage from running far ahead of a slow one. End-to-end
+time for a batch approaches that of the slowest stage instead of the sum.
+
+    pipeline = Pipeline([Stage('fetch', fetch, workers=8), Stage('parse', parse)])
+    for item in pipeline.run(items):  # in completion order
+        ...
+    print(format_stats(pipeline.stats()))
+
+run() has to be consumed to the end; the worker threads stop once all items are through.
+"""
+import queue
+import threading
+import time
+
+# Put on a queue once per worker after the last item
+_DONE = object()
+
+
+class Stage:
+    def __init__(self, name, function, workers=1, queue_size=None):
+        """function(item) -> item runs in `workers` threads; the queue in front holds queue_size items."""
+        self.name = name
+        self.function = function
+        self.workers = workers
+        # A couple of items per worker, so workers rarely wait on the stage before
+        self.queue_size = queue_size or 2 * workers
+
+
+class Pipeline:
+    def __init__(self, stages, on_error=None, initializer=None):
+        """
+        on_error(item, stage_name, error) -> item is called when a stage raises, and the
+        item it returns goes on to the next stage. Without it, or if it raises as well, the
+        item goes on unchanged.
+        initializer() runs at the start of every worker thread.
+        """
+        self.stages = stages
+        self.on_error = on_error
+        self.initializer = initializer
+        self._stats = None
+
+    def run(self, items):
+        """Feed items through every stage and yield them as they come out of the last one."""
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages] + [queue.Queue()]
+        stats = [{'stage': stage.name, 'workers': stage.workers, 'processed': 0, 'errors': 0, 'busy_seconds': 0.0,
+                  'max_queue_depth': 0, 'queue_depth_total': 0} for stage in self.stages]
+        running = [stage.workers for stage in self.stages]
+        # Items waiting in each queue; qsize() would count the _DONE markers too
+        waiting = [0] * len(self.stages)
+        lock = threading.Lock()
+
+        def feed():
+            for item in items:
+                with lock:
+                    waiting[0] += 1
+                queues[0].put(item)
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_DONE)
+
+        def work(i):
+            stage, inbox, outbox, stat = self.stages[i], queues[i], queues[i + 1], stats[i]
+            try:
+                if self.initializer:
+                    try:
+                        self.initializer()
+                    except Exception as e:
+                        # The items still have to go through; only print the failure
+                        print(f"[{stage.name}] initializer failed: {e!r}")
+                while True:
+                    item = inbox.get()
+                    if item is _DONE:
+                        break
+                    # Items still waiting for this stage when a worker takes the next one
+                    with lock:
+                        waiting[i] -= 1
+                        depth = waiting[i]
+                    start = time.perf_counter()
+                    failed = False
+                    try:
+                        item = stage.function(item)
+                    except Exception as e:
+                        failed = True
+                        try:
+                            if self.on_error:
+                                item = self.on_error(item, stage.name, e)
+                            else:
+                                print(f"[{stage.name}] {e!r}")
+                        except Exception as handler_error:
+                            # The item goes on unchanged, still counted as an error
+                            print(f"[{stage.name}] {e!r}, and on_error failed: {handler_error!r}")
+                    busy = time.perf_counter() - start
+                    with lock:
+                        stat['processed'] += 1
+                        stat['errors'] += failed
+                        stat['busy_seconds'] += busy
+                        stat['max_queue_depth'] = max(stat['max_queue_depth'], depth)
+                        stat['queue_depth_total'] += depth
+                        if i + 1 < len(self.stages):
+                            waiting[i + 1] += 1
+                    outbox.put(item)
+            finally:
+                # The last worker out tells the next stage (or run()) that nothing else is coming,
+                # even if this one stopped on an unexpected error
+                with lock:
+                    running[i] -= 1
+                    last = running[i] == 0
+                if last:
+                    next_workers = self.stages[i + 1].workers if i + 1 < len(self.stages) else 1
+                    for _ in range(next_workers):
+                        outbox.put(_DONE)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=feed, daemon=True)]
+        for i, stage in enumerate(self.stages):
+            threads += [threading.Thread(target=work, args=(i,), daemon=True, name=f"{stage.name}-{n}")
+                        for n in range(stage.workers)]
+        for thread in threads:
+            thread.start()
+
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                break
+            yield item
+
+        elapsed = time.perf_counter() - start
+        for stat in stats:
+            processed = stat['processed']
+            stat['busy_seconds'] = round(stat['busy_seconds'], 3)
+            # Share of the run the stage's workers spent working rather than waiting
+            stat['utilization'] = round(stat['busy_seconds'] / (stat['workers'] * elapsed), 3) if elapsed else 0.0
+            stat['mean_queue_depth'] = round(stat.pop('queue_depth_total') / processed, 2) if processed else 0.0
+        self._stats = {'elapsed_seconds': round(elapsed, 3), 'stages': stats}
+
+    def stats(self):
+        """Per-stage counts, busy time, utilization and queue depth of the last finished run."""
+        return self._stats
+
+
+def format_stats(stats):
+    lines = [f"{'stage':<16}{'workers':>8}{'items':>7}{'busy s':>9}{'util':>7}{'queue max':>11}{'mean':>7}"]
+    for stat in stats['stages']:
+        lines.append(f"{stat['stage']:<16}{stat['workers']:>8}{stat['processed']:>7}{stat['busy_seconds']:>9.2f}"
+                     f"{stat['utilization']:>7.0%}{stat['max_queue_depth']:>11}{stat['mean_queue_depth']:>7.1f}")
+    lines.append(f"total {stats['elapsed_seconds']:.2f}s")
+    return "\n".join(lines)
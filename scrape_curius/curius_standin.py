@@ -0,0 +1,203 @@
+"""
+Local stand-in for curius.app, for benchmarking the scraper modes offline.
+
+Serves the two JSON endpoints the Curius frontend reads and a small page that
+renders them client-side with the same class names the Selenium scraper looks
+for, so both modes can run against identical data:
+
+    python curius_standin.py --port 8000 &
+    time python scrape_curius.py http://127.0.0.1:8000/standin --mode api
+    time python scrape_curius.py http://127.0.0.1:8000/standin --mode selenium
+"""
+import argparse
+import csv
+import json
+import os
+import threading
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+USER_ID = 4242
+
+PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Curius stand-in</title></head>
+<body>
+<div id="links"></div>
+<div class="css-gsabod"><span id="prev">prev</span> <span id="next">next</span></div>
+<script>
+const USERNAME = %(username)s;
+const RENDER_DELAY_MS = %(delay_ms)d;
+let userId = null;
+let page = 0;
+
+function relativeTime(timestamp) {
+  const seconds = Math.max((Date.now() - Date.parse(timestamp)) / 1000, 0);
+  const days = seconds / 86400;
+  let value, unit;
+  if (seconds < 60) { value = Math.round(seconds); unit = "second"; }
+  else if (seconds < 3600) { value = Math.round(seconds / 60); unit = "minute"; }
+  else if (seconds < 86400) { value = Math.round(seconds / 3600); unit = "hour"; }
+  else if (Math.round(days) < 7) { value = Math.round(days); unit = "day"; }
+  else if (days < 28) { value = Math.round(days / 7); unit = "week"; }
+  else if (Math.round(days / 30.44) < 12) { value = Math.round(days / 30.44); unit = "month"; }
+  else { value = Math.round(days / 365.25); unit = "year"; }
+  return value + " " + unit + (value === 1 ? "" : "s") + " ago";
+}
+
+async function loadPage(n) {
+  if (userId === null) {
+    userId = (await (await fetch("/api/users/" + USERNAME)).json()).user.id;
+  }
+  const data = await (await fetch("/api/users/" + userId + "/links?page=" + n)).json();
+  const more = (await (await fetch("/api/users/" + userId + "/links?page=" + (n + 1))).json()).userSaved.length > 0;
+  // Simulate the frontend's render latency
+  await new Promise(resolve => setTimeout(resolve, RENDER_DELAY_MS));
+
+  const root = document.getElementById("links");
+  root.innerHTML = "";
+  for (const link of data.userSaved) {
+    const row = document.createElement("div");
+    row.className = "css-1eicj7r";
+    const container = document.createElement("div");
+    container.className = "css-1so9d0e";
+    const a = document.createElement("a");
+    a.href = link.link;
+    a.textContent = link.title;
+    container.appendChild(a);
+    row.appendChild(container);
+    if (link.createdDate) {
+      const time = document.createElement("time");
+      time.setAttribute("datetime", link.createdDate);
+      time.textContent = relativeTime(link.createdDate);
+      row.appendChild(time);
+    }
+    root.appendChild(row);
+  }
+  document.getElementById("next").setAttribute("style", more ? "visibility: visible;" : "visibility: hidden;");
+  page = n;
+}
+
+document.getElementById("next").addEventListener("click", () => loadPage(page + 1));
+loadPage(0);
+</script>
+</body>
+</html>
+"""
+
+
+def load_bookmarks(csv_path=None, count=None):
+    """Bookmarks as Curius API records, newest first.
+
+    Uses the rows of an existing export when csv_path is given, otherwise
+    generates `count` synthetic ones.
+    """
+    if csv_path:
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        return [{
+            'id': i,
+            'title': row['title'],
+            'link': row['url'],
+            'createdDate': row['timestamp'] or None,
+        } for i, row in enumerate(rows)]
+
+    now = datetime.now(timezone.utc)
+    return [{
+        'id': i,
+        'title': f"Stand-in bookmark {i}",
+        'link': f"https://example.com/articles/{i}",
+        'createdDate': (now - timedelta(hours=7 * i + 1)).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+    } for i in range(count)]
+
+
+class CuriusStandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, bookmarks, page_size=30, render_delay=0.0, username='standin'):
+        super().__init__(address, CuriusStandinHandler)
+        self.bookmarks = bookmarks
+        self.page_size = page_size
+        self.render_delay = render_delay
+        self.username = username
+        self.lock = threading.Lock()
+        self.api_requests = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/{self.username}"
+
+
+class CuriusStandinHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        parts = [p for p in parsed.path.split('/') if p]
+        params = parse_qs(parsed.query)
+        server = self.server
+
+        if parts[:2] == ['api', 'users'] and len(parts) == 3:
+            with server.lock:
+                server.api_requests += 1
+            # Every username resolves, so batch scrapes of many users can be benchmarked
+            user_id = USER_ID + zlib.crc32(parts[2].encode('utf-8')) % 100000
+            self.send_body(200, {'user': {'id': user_id, 'userLink': parts[2]}})
+        elif parts[:2] == ['api', 'users'] and len(parts) == 4 and parts[3] == 'links':
+            with server.lock:
+                server.api_requests += 1
+            page = int(params.get('page', ['0'])[0])
+            start = page * server.page_size
+            self.send_body(200, {'userSaved': server.bookmarks[start:start + server.page_size]})
+        elif len(parts) == 1:
+            html = PAGE_HTML % {
+                'username': json.dumps(parts[0]),
+                'delay_ms': int(server.render_delay * 1000),
+            }
+            self.send_body(200, html, content_type='text/html; charset=utf-8')
+        else:
+            self.send_body(404, {'error': 'not found'})
+
+    def send_body(self, status, body, content_type='application/json'):
+        payload = (body if isinstance(body, str) else json.dumps(body)).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def start_server(port=0, bookmarks=None, **kwargs):
+    """Start the stand-in on a background thread and return the server."""
+    if bookmarks is None:
+        bookmarks = load_bookmarks(os.path.join(HERE, 'curius_bookmarks.csv'))
+    server = CuriusStandinServer(('127.0.0.1', port), bookmarks, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for curius.app")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--csv', default=os.path.join(HERE, 'curius_bookmarks.csv'),
+                        help="serve the rows of this export (default: curius_bookmarks.csv)")
+    parser.add_argument('--count', type=int, help="serve this many synthetic bookmarks instead of --csv")
+    parser.add_argument('--page-size', type=int, default=30)
+    parser.add_argument('--render-delay', type=float, default=0.0,
+                        help="seconds the page waits before rendering each page of bookmarks")
+    parser.add_argument('--username', default='standin')
+    args = parser.parse_args()
+
+    bookmarks = load_bookmarks(count=args.count) if args.count else load_bookmarks(args.csv)
+    server = CuriusStandinServer(('127.0.0.1', args.port), bookmarks, page_size=args.page_size,
+                                 render_delay=args.render_delay, username=args.username)
+    print(f"Curius stand-in serving {len(bookmarks)} bookmarks at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -3,113 +3,518 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+import argparse
+import requests
 import csv
-import time
 import sys
+import os
+import functools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+CSV_FIELDS = ['title', 'url', 'timestamp', 'relative_time']
+
+def relative_time(timestamp, now=None):
+    """Format an ISO timestamp the way the Curius frontend does ("2 days ago", "3 weeks ago")."""
+    if not timestamp:
+        return ""
+    now = now or datetime.now(timezone.utc)
+    then = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    seconds = max((now - then).total_seconds(), 0)
+    days = seconds / 86400
+
+    if seconds < 60:
+        value, unit = round(seconds), "second"
+    elif seconds < 3600:
+        value, unit = round(seconds / 60), "minute"
+    elif seconds < 86400:
+        value, unit = round(seconds / 3600), "hour"
+    elif round(days) < 7:
+        value, unit = round(days), "day"
+    elif days < 28:
+        value, unit = round(days / 7), "week"
+    elif round(days / 30.44) < 12:
+        value, unit = round(days / 30.44), "month"
+    else:
+        value, unit = round(days / 365.25), "year"
+    return f"{value} {unit}{'' if value == 1 else 's'} ago"
+
+def make_session(pool_size=8):
+    """requests session with keep-alive connection pooling and retries on transient errors."""
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers['Accept'] = 'application/json'
+    return session
+
+def split_user_url(url):
+    """https://curius.app/USERNAME -> ("https://curius.app", "USERNAME")"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}", parsed.path.strip('/').split('/')[0]
+
+def iter_api_pages(url, session=None, label=''):
+    """Yield one list of bookmarks per page from the JSON endpoints the Curius frontend uses.
+
+    label goes in front of every progress line, e.g. "[USERNAME] " in batch mode.
+    """
+    session = session or make_session()
+    base_url, username = split_user_url(url)
+
+    response = session.get(f"{base_url}/api/users/{username}", timeout=30)
+    response.raise_for_status()
+    user_id = response.json()['user']['id']
 
-def scrape_curius(url):
+    now = datetime.now(timezone.utc)
+    page = 0
+    while True:
+        response = session.get(f"{base_url}/api/users/{user_id}/links", params={'page': page}, timeout=30)
+        response.raise_for_status()
+        # A well-formed empty list is an account with no (more) bookmarks; anything else means the API changed
+        links = response.json()['userSaved']
+        if not isinstance(links, list):
+            raise ValueError(f"unexpected userSaved in API response: {links!r:.100}")
+        if not links:
+            break
+        if not any(isinstance(link, dict) and link.get('link') for link in links):
+            raise ValueError(f"no bookmark URLs on API page {page + 1}")
+
+        print(f"{label}Fetched page {page + 1} ({len(links)} bookmarks)")
+        page += 1
+        yield [{
+            'title': (link.get('title') or "").strip(),
+            'url': link.get('link'),
+            'timestamp': link.get('createdDate') or "",
+            'relative_time': relative_time(link.get('createdDate'), now)
+        } for link in links]
+
+    print(f"\n{label}Finished fetching {page} pages!")
+
+def scrape_curius_api(url, session=None):
+    """Read bookmarks from the JSON endpoints the Curius frontend uses, without a browser."""
+    return [bookmark for page in iter_api_pages(url, session) for bookmark in page]
+
+# Pulls every bookmark on the current page plus the "next" button in a single
+# WebDriver round trip instead of several find_element calls per bookmark
+EXTRACT_PAGE_JS = """
+const bookmarks = [];
+for (const container of document.getElementsByClassName('css-1so9d0e')) {
+    const link = container.querySelector('a');
+    if (!link) continue;
+    const title = link.innerText.trim();
+    const url = link.href;
+    if (!url || !title) continue;
+    const row = container.closest('div[class*="css-1eicj7r"]');
+    const time = row ? row.querySelector('time') : null;
+    bookmarks.push({
+        title: title,
+        url: url,
+        timestamp: time ? (time.getAttribute('datetime') || '') : '',
+        relative_time: time ? time.innerText.trim() : ''
+    });
+}
+const next = document.evaluate(
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' css-gsabod ')]" +
+    "//span[@style='visibility: visible;'][text()='next']",
+    document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return {
+    bookmarks: bookmarks,
+    next: next && next.offsetParent !== null ? next : null
+};
+"""
+
+FIRST_URL_JS = """
+const link = document.querySelector('.css-1so9d0e a');
+return link ? link.href : null;
+"""
+
+def first_url_changed(previous_url):
+    """Wait condition: the first bookmark on the page is no longer previous_url."""
+    def condition(driver):
+        url = driver.execute_script(FIRST_URL_JS)
+        return url is not None and url != previous_url
+    return condition
+
+@functools.lru_cache(maxsize=None)
+def get_driver_path():
+    """Resolve (and download if needed) chromedriver once per process."""
+    return ChromeDriverManager().install()
+
+def make_driver():
     options = webdriver.ChromeOptions()
     options.add_argument('--headless')
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    
+    return webdriver.Chrome(service=Service(get_driver_path()), options=options)
+
+class BrowserPool:
+    """A bounded set of warm headless Chrome instances shared between scraping threads."""
+
+    def __init__(self, size, wait_timeout=600):
+        self.size = size
+        self.wait_timeout = wait_timeout  # seconds a user waits for a free browser before giving up
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            # Start another browser if the pool isn't full yet, otherwise wait for one
+            with self._lock:
+                start_new = self._started < self.size
+                if start_new:
+                    self._started += 1
+            if start_new:
+                try:
+                    driver = make_driver()
+                except Exception:
+                    # Give the slot back, so the next user can try to start a browser
+                    with self._lock:
+                        self._started -= 1
+                    raise
+                with self._lock:
+                    self._drivers.append(driver)
+                return driver
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No browser became free within {self.wait_timeout} seconds")
+            # Wake up now and then in case a slot was freed by a browser that failed
+            try:
+                return self._idle.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                pass
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            self._started -= 1
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    @contextmanager
+    def driver(self):
+        driver = self._acquire()
+        try:
+            yield driver
+        except WebDriverException:
+            # The browser may have crashed; don't hand it to the next user
+            self._discard(driver)
+            raise
+        except BaseException:
+            self._idle.put(driver)
+            raise
+        else:
+            self._idle.put(driver)
+
+    def close(self):
+        for driver in self._drivers:
+            driver.quit()
+        self._drivers = []
+
+def iter_selenium_pages(url, page_timeout=30, driver=None, label=''):
+    """Yield one list of bookmarks per page by driving headless Chrome through the site.
+
+    A driver passed in (e.g. from a BrowserPool) is left running afterwards.
+    """
+    owns_driver = driver is None
+    driver = driver or make_driver()
+    wait = WebDriverWait(driver, page_timeout, poll_frequency=0.1)
+
     try:
-        print("Loading initial page...")
+        print(f"{label}Loading initial page...")
         driver.get(url)
-        bookmarks = []
         page = 1
-        
+
+        try:
+            wait.until(EC.presence_of_element_located((By.CLASS_NAME, "css-1so9d0e")))
+        except TimeoutException:
+            print(f"{label}No bookmarks appeared within {page_timeout} seconds")
+            return
+
         while True:
-            print(f"\nProcessing page {page}...")
-            time.sleep(5)
-            
-            # Scrape current page
-            link_containers = driver.find_elements(By.CLASS_NAME, "css-1so9d0e")
-            print(f"Found {len(link_containers)} link containers on page {page}")
-            
-            for container in link_containers:
-                try:
-                    # Get title and URL first
-                    elements = container.find_elements(By.XPATH, ".//*")
-                    url = None
-                    title = None
-                    for element in elements:
-                        if element.tag_name == "a":
-                            url = element.get_attribute('href')
-                            title = element.text.strip()
-                            break
-                    
-                    if url and title:
-                        # Try to get timestamp, but don't fail if we can't find it
-                        timestamp = ""
-                        relative_time = ""
-                        try:
-                            parent = container.find_element(By.XPATH, "./ancestor::div[contains(@class, 'css-1eicj7r')]")
-                            time_element = parent.find_element(By.TAG_NAME, "time")
-                            timestamp = time_element.get_attribute('datetime')
-                            relative_time = time_element.text.strip()
-                        except Exception as e:
-                            print(f"Couldn't find time for entry: {title}")
-                        
-                        bookmarks.append({
-                            'title': title,
-                            'url': url,
-                            'timestamp': timestamp,
-                            'relative_time': relative_time
-                        })
-                        print(f"Successfully processed: {title} ({relative_time if relative_time else 'no time found'})")
-                
-                except Exception as e:
-                    print(f"Skipping one entry due to: {str(e)}")
-                    continue
-            
-            # Look for next button
+            print(f"\n{label}Processing page {page}...")
+            result = driver.execute_script(EXTRACT_PAGE_JS)
+            page_bookmarks = result['bookmarks']
+            print(f"{label}Found {len(page_bookmarks)} bookmarks on page {page}")
+
+            for bookmark in page_bookmarks:
+                if not bookmark['timestamp']:
+                    print(f"{label}Couldn't find time for entry: {bookmark['title']}")
+            yield page_bookmarks
+
+            next_span = result['next']
+            if next_span is None:
+                print(f"{label}Next button not visible - reached last page")
+                break
+
+            # Wait for the next page to replace this one instead of sleeping a fixed time
+            previous_url = page_bookmarks[0]['url'] if page_bookmarks else None
+            next_span.click()
+            page += 1
+            print(f"{label}Moving to page {page}...")
             try:
-                next_container = driver.find_element(By.CLASS_NAME, "css-gsabod")
-                next_span = next_container.find_element(By.XPATH, ".//span[@style='visibility: visible;'][text()='next']")
-                
-                if next_span.is_displayed():
-                    next_span.click()
-                    page += 1
-                    print(f"Moving to page {page}...")
-                    time.sleep(5)
-                else:
-                    print("Next button not visible - reached last page")
-                    break
-                    
-            except Exception as e:
-                print(f"No next button found: {str(e)}")
+                wait.until(first_url_changed(previous_url))
+            except TimeoutException:
+                print(f"{label}Page {page} did not load within {page_timeout} seconds")
                 break
-        
-        print(f"\nFinished scraping {page} pages!")
-        return bookmarks
-    
+
+        print(f"\n{label}Finished scraping {page} pages!")
+
     finally:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
+
+def scrape_curius(url, page_timeout=30):
+    return [bookmark for page in iter_selenium_pages(url, page_timeout) for bookmark in page]
 
 def save_to_csv(bookmarks, filename='curius_bookmarks.csv'):
     with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['title', 'url', 'timestamp', 'relative_time'])
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
         writer.writeheader()
         writer.writerows(bookmarks)
 
+def iter_pages(url, mode='auto', session=None, browser_pool=None, label=''):
+    """Yield pages of bookmarks, newest first, using the requested scraping mode."""
+    if mode in ('api', 'auto'):
+        pages = iter_api_pages(url, session, label)
+        try:
+            first_page = next(pages, None)
+        except (requests.RequestException, ValueError, KeyError, TypeError, AttributeError) as e:
+            if mode == 'api':
+                raise
+            print(f"{label}JSON API failed ({e!r}), falling back to Selenium")
+        else:
+            # No first page means the account has no bookmarks, not that the API failed
+            if first_page is not None:
+                yield first_page
+                yield from pages
+            return
+    if browser_pool is None:
+        yield from iter_selenium_pages(url, label=label)
+    else:
+        with browser_pool.driver() as driver:
+            yield from iter_selenium_pages(url, driver=driver, label=label)
+
+def scrape(url, mode='auto'):
+    return [bookmark for page in iter_pages(url, mode) for bookmark in page]
+
+def load_from_csv(filename='curius_bookmarks.csv'):
+    try:
+        with open(filename, newline='', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+    except FileNotFoundError:
+        return []
+
+def newest_bookmark(bookmarks):
+    """(timestamp, url) of the most recently saved bookmark, or (None, None)."""
+    timestamped = [b for b in bookmarks if b.get('timestamp')]
+    if not timestamped:
+        return None, None
+    newest = max(timestamped, key=lambda b: parse_timestamp(b['timestamp']))
+    return newest['timestamp'], newest['url']
+
+def parse_timestamp(timestamp):
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+def export_bookmarks(pages, filename='curius_bookmarks.csv', incremental=False, label=''):
+    """Write pages to CSV as they arrive and return how many bookmarks were new.
+
+    Rows are streamed to FILENAME.partial and flushed after every page, so a
+    crash keeps everything scraped so far; the real file is only replaced once
+    scraping finishes. In incremental mode pagination stops at the first
+    bookmark that is not newer than the newest one already in FILENAME, and
+    the new rows are merged on top of the existing ones.
+    """
+    existing = load_from_csv(filename) if incremental else []
+    stop_timestamp, stop_url = newest_bookmark(existing)
+    stop_at = parse_timestamp(stop_timestamp) if stop_timestamp else None
+    known_urls = {b['url'] for b in existing}
+    if stop_at:
+        print(f"{label}Newest stored bookmark: {stop_url} ({stop_timestamp})")
+
+    partial_filename = f"{filename}.partial"
+    new_count = 0
+    reached_known = False
+    with open(partial_filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+        for page in pages:
+            new_rows = []
+            for bookmark in page:
+                if stop_at and bookmark['timestamp']:
+                    if (bookmark['url'] == stop_url and bookmark['timestamp'] == stop_timestamp) \
+                            or parse_timestamp(bookmark['timestamp']) <= stop_at:
+                        reached_known = True
+                        break
+                elif stop_at and bookmark['url'] in known_urls:
+                    continue
+                new_rows.append(bookmark)
+
+            writer.writerows(new_rows)
+            f.flush()
+            new_count += len(new_rows)
+
+            if reached_known:
+                print(f"{label}Reached previously saved bookmarks - stopping")
+                # Closing the generator stops pagination (and quits the browser)
+                pages.close()
+                break
+
+    if not incremental and new_count == 0:
+        # Don't replace a previous export with an empty one
+        os.remove(partial_filename)
+        return 0
+
+    if incremental and existing:
+        # Curius timestamps only move forward, so new rows go on top; refresh the
+        # stored relative times while we are rewriting the file anyway
+        now = datetime.now(timezone.utc)
+        for bookmark in existing:
+            if bookmark.get('timestamp'):
+                bookmark['relative_time'] = relative_time(bookmark['timestamp'], now)
+        merged = load_from_csv(partial_filename) + existing
+        save_to_csv(merged, partial_filename)
+
+    os.replace(partial_filename, filename)
+    return new_count
+
+def normalize_username(user):
+    """Accept USERNAME, curius.app/USERNAME or https://curius.app/USERNAME."""
+    return user.strip().rstrip('/').split('/')[-1]
+
+class CombinedCSVWriter:
+    """Thread-safe writer for one CSV holding several users' bookmarks, keyed by a user column."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.partial_filename = f"{filename}.partial"
+        self._file = open(self.partial_filename, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=['user'] + CSV_FIELDS)
+        self._writer.writeheader()
+        self._lock = threading.Lock()
+
+    def write_page(self, username, bookmarks):
+        with self._lock:
+            self._writer.writerows({'user': username, **bookmark} for bookmark in bookmarks)
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+        os.replace(self.partial_filename, self.filename)
+
+def scrape_users(usernames, base_url='https://curius.app', mode='auto', workers=4,
+                 out_dir='.', combined=None, incremental=False):
+    """Scrape several users in parallel, sharing one HTTP session and a pool of warm browsers.
+
+    Each user goes to OUT_DIR/curius_USERNAME.csv, or, with `combined`, into one
+    file with a leading user column. Returns {username: bookmark count}.
+    """
+    session = make_session(pool_size=workers)
+    browser_pool = BrowserPool(workers) if mode != 'api' else None
+    combined_writer = CombinedCSVWriter(combined) if combined else None
+    if not combined:
+        os.makedirs(out_dir, exist_ok=True)
+
+    def scrape_user(username):
+        # Workers print at the same time, so every progress line says whose it is
+        label = f"[{username}] "
+        pages = iter_pages(f"{base_url}/{username}", mode, session, browser_pool, label)
+        if combined_writer:
+            count = 0
+            for page in pages:
+                combined_writer.write_page(username, page)
+                count += len(page)
+            return count
+        filename = os.path.join(out_dir, f"curius_{username}.csv")
+        return export_bookmarks(pages, filename, incremental, label)
+
+    counts = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(scrape_user, username): username for username in usernames}
+            for future in as_completed(futures):
+                username = futures[future]
+                try:
+                    counts[username] = future.result()
+                    print(f"[{username}] {counts[username]} bookmarks")
+                except Exception as e:
+                    print(f"[{username}] failed: {e}")
+    finally:
+        if browser_pool:
+            browser_pool.close()
+        if combined_writer:
+            combined_writer.close()
+    return counts
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python scrape_curius.py curius.app/USERNAME")
-        sys.exit(1)
-    
-    url = sys.argv[1]
-    # Strip https:// if provided
-    url = url.replace("https://", "")
-    url = f"https://{url}"
-    
-    if not url.startswith("https://curius.app/"):
-        print("Error: URL must be in format curius.app/USERNAME")
+    parser = argparse.ArgumentParser(description="Save Curius bookmarks to a CSV file")
+    parser.add_argument('url', nargs='?',
+                        help="curius.app/USERNAME (or http://host:port/USERNAME for a local stand-in)")
+    parser.add_argument('--mode', choices=['auto', 'api', 'selenium'], default='auto',
+                        help="api reads the JSON endpoints directly, selenium drives headless Chrome, "
+                             "auto tries api first and falls back to selenium")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only fetch bookmarks newer than those already in the output file")
+    parser.add_argument('--output', default='curius_bookmarks.csv')
+
+    batch = parser.add_argument_group('batch mode')
+    batch.add_argument('--users', nargs='+', default=[], help="scrape several users in parallel")
+    batch.add_argument('--users-file', help="file with one username per line")
+    batch.add_argument('--workers', type=int, default=4, help="parallel users / browser instances")
+    batch.add_argument('--out-dir', default='.', help="directory for the per-user curius_USERNAME.csv files")
+    batch.add_argument('--combined', help="write every user into this one CSV, with a user column")
+    batch.add_argument('--base-url', default='https://curius.app')
+    args = parser.parse_args()
+
+    usernames = [normalize_username(u) for u in args.users]
+    if args.users_file:
+        with open(args.users_file, encoding='utf-8') as f:
+            usernames += [normalize_username(line) for line in f if line.strip()]
+
+    if usernames:
+        if args.combined and args.incremental:
+            print("Error: --incremental works with per-user files, not --combined")
+            sys.exit(1)
+        counts = scrape_users(usernames, args.base_url.rstrip('/'), args.mode, args.workers,
+                              args.out_dir, args.combined, args.incremental)
+        print(f"\nScraped {sum(counts.values())} bookmarks for {len(counts)}/{len(usernames)} users")
+        sys.exit(0)
+
+    if not args.url:
+        parser.print_usage()
         sys.exit(1)
-        
-    bookmarks = scrape_curius(url)
-    if bookmarks:
-        save_to_csv(bookmarks)
-        print(f"\nSuccessfully scraped {len(bookmarks)} bookmarks!")
+
+    url = args.url
+    # Plain http:// is only used for local stand-ins such as curius_standin.py
+    if not url.startswith("http://"):
+        # Strip https:// if provided
+        url = url.replace("https://", "")
+        url = f"https://{url}"
+
+        if not url.startswith("https://curius.app/"):
+            print("Error: URL must be in format curius.app/USERNAME")
+            sys.exit(1)
+
+    new_count = export_bookmarks(iter_pages(url, args.mode), args.output, args.incremental)
+    if new_count:
+        print(f"\nSuccessfully scraped {new_count} {'new ' if args.incremental else ''}bookmarks!")
     else:
-        print("No bookmarks found!")
+        print("No new bookmarks found!" if args.incremental else "No bookmarks found!")
@@ -2,110 +2,180 @@ from manim import *
 import numpy as np
 from scipy.special import fresnel
 
+
+class LaggedCreate(Animation):
+    """
+    Same result as LaggedStart(*[Create(m) for m in group], lag_ratio=lag_ratio),
+    but as one animation over the whole group.
+
+    LaggedStart keeps a Create (and a copy of its mobject) per segment and steps
+    every one of them each frame. Here the timings are a single NumPy array and only
+    the segments whose progress changed since the last frame get their points updated.
+    Parts that haven't started yet are left without points instead of collapsed onto
+    their first point, so the camera skips them entirely rather than drawing nothing.
+    """
+
+    def __init__(self, group, lag_ratio, **kwargs):
+        # Each Create lasts one time unit and starts lag_ratio after the previous one
+        self.starts = np.arange(len(group)) * lag_ratio
+        self.total_time = self.starts[-1] + 1
+        self.shown = np.full(len(group), -1.0)
+        super().__init__(group, lag_ratio=lag_ratio, introducer=True, rate_func=linear, **kwargs)
+
+    def interpolate_mobject(self, alpha):
+        progress = np.clip(self.rate_func(alpha) * self.total_time - self.starts, 0, 1)
+        for i in np.nonzero(progress != self.shown)[0]:
+            members = self.mobject[i].get_family()
+            originals = self.starting_mobject[i].get_family()
+            # Create draws the members of a mobject (an arrow's line, then its tip) one after another
+            for j, (member, original) in enumerate(zip(members, originals)):
+                proportion = smooth(progress[i] * len(members) - j)
+                if proportion > 0:
+                    member.pointwise_become_partial(original, 0, proportion)
+                else:
+                    member.clear_points()
+        self.shown = progress
+
+
+def arrow_geometry(starts, ends, max_tip_length=DEFAULT_ARROW_TIP_LENGTH,
+                   max_tip_length_to_length_ratio=0.25, stroke_width=6, max_stroke_width_to_length_ratio=5):
+    """
+    Points and stroke widths of Arrow(start, end, buff=0) for every start/end pair at once.
+
+    Returns (line points (n, 4, 3), tip points (n, k, 3), stroke widths (n,)), the same
+    shapes Arrow builds one by one: the tip length and line width shrink for short arrows
+    and the line stops at the base of the tip.
+    """
+    vectors = ends - starts
+    lengths = np.linalg.norm(vectors, axis=1)
+    tip_lengths = np.minimum(max_tip_length, max_tip_length_to_length_ratio * lengths)
+
+    # One unit tip from manim, scaled, rotated and moved onto every arrow with complex numbers
+    unit_tip = ArrowTriangleFilledTip(length=1, width=1)
+    to_complex = lambda points: points[..., 0] + 1j * points[..., 1]
+    outline = to_complex(unit_tip.points - unit_tip.tip_point)
+    base = to_complex(unit_tip.base - unit_tip.tip_point)
+    rotation = np.exp(1j * (np.angle(to_complex(vectors)) - unit_tip.tip_angle)) * tip_lengths
+    tip_xy = outline[np.newaxis, :] * rotation[:, np.newaxis] + to_complex(ends)[:, np.newaxis]
+    tip_points = np.stack([tip_xy.real, tip_xy.imag, np.zeros_like(tip_xy.real)], axis=-1)
+
+    base_xy = base * rotation + to_complex(ends)
+    line_ends = np.column_stack([base_xy.real, base_xy.imag, np.zeros(len(ends))])
+    # A straight line is a single cubic with its handles at 1/3 and 2/3
+    thirds = np.linspace(0, 1, 4)[np.newaxis, :, np.newaxis]
+    line_points = starts[:, np.newaxis, :] + thirds * (line_ends - starts)[:, np.newaxis, :]
+
+    stroke_widths = np.minimum(stroke_width, max_stroke_width_to_length_ratio * lengths)
+    return line_points, tip_points, stroke_widths
+
+
 class CornuSpiral(Scene):
+    # === CUSTOMIZABLE PARAMETERS ===
+    # Adjust these values to tweak the visualization (sweep.py renders several combinations at once)
+    SPIRAL_SCALE = 3.8        # Size of the spiral (higher = bigger)
+    SPIRAL_Y_POSITION = 0.8   # Vertical position of spiral (higher = more up)
+    PATH_Y_POSITION = -3.0    # Vertical position of A-B points (lower = more down)
+    PATH_HEIGHT_MAX = 1.5     # Maximum height of the V-shaped paths
+    PATH_SAMPLING = 5         # Show one path for every N arrows (higher = fewer paths)
+    # ==============================
+
+    # Number of discrete segments
+    N = 150 # I WANT THIS NUMBER OF DISCRETE SEGMENTS.
+
     def construct(self):
-        # === CUSTOMIZABLE PARAMETERS ===
-        # Adjust these values to tweak the visualization
-        SPIRAL_SCALE = 3.8        # Size of the spiral (higher = bigger)
-        SPIRAL_Y_POSITION = 0.8   # Vertical position of spiral (higher = more up)
-        PATH_Y_POSITION = -3.0    # Vertical position of A-B points (lower = more down)
-        PATH_HEIGHT_MAX = 1.5     # Maximum height of the V-shaped paths
-        PATH_SAMPLING = 5         # Show one path for every N arrows (higher = fewer paths)
-        # ==============================
-        
         # Set transparent background
         self.camera.background_color = None
-        
-        # Parametric definition of the Cornu spiral
-        def param_spiral(t):
-            x, y = fresnel(t)
-            return SPIRAL_SCALE * np.array([x, y, 0])
-        
-        # Number of discrete segments
-        N = 150 # I WANT THIS NUMBER OF DISCRETE SEGMENTS.
-        
+
+        N = self.N
+
         # Parameter samples from t = -4 to t = 4
         t_values = np.linspace(-5, 5, N)
-        
+
+        # Every point of the Cornu spiral from a single fresnel call
+        fresnel_s, fresnel_c = fresnel(t_values)
+        spiral_points = self.SPIRAL_SCALE * np.column_stack([fresnel_s, fresnel_c, np.zeros(N)])
+
         # Create a vibrant color gradient with more color stops
         segment_colors = color_gradient([
-            "#FF0000",  
-            "#FF7700",  
-            "#FFDD00",  
-            "#00FF00",  
-            "#00CCCC"   
+            "#FF0000",
+            "#FF7700",
+            "#FFDD00",
+            "#00FF00",
+            "#00CCCC"
         ], N - 1)
-        
-        # Build all the arrows
+
+        # Geometry of all the arrows at once, from one point to the next
+        line_points, tip_points, stroke_widths = arrow_geometry(spiral_points[:-1], spiral_points[1:])
+
+        # Move the spiral up to leave space for the paths, but ensure it stays on screen
+        all_points = np.concatenate([line_points.reshape(-1, 3), tip_points.reshape(-1, 3)])
+        offset = UP * self.SPIRAL_Y_POSITION - (all_points.min(axis=0) + all_points.max(axis=0)) / 2
+        line_points += offset
+        tip_points += offset
+
+        # Each arrow is a plain VMobject line with its filled tip as a submobject, like Arrow, but
+        # without Arrow's per-arrow construction (tip creation, rotation, shortening).
+        # They stay separate mobjects: the camera strokes a VMobject with one width and one color
+        # (or one gradient across all of it), and every arrow here has its own color and width.
+        # LaggedCreate also reveals them one by one, so packing them would change the picture.
         arrows = VGroup()
         for i in range(N - 1):
-            start_point = param_spiral(t_values[i])
-            end_point   = param_spiral(t_values[i + 1])
-            arrow = Arrow(
-                start_point,
-                end_point,
-                buff=0
-            ).set_color(segment_colors[i])
-            arrows.add(arrow)
-        
-        # Move the spiral up to leave space for the paths, but ensure it stays on screen
-        arrows.center()
-        arrows.shift(UP * SPIRAL_Y_POSITION)
-        
+            arrow = VMobject(stroke_color=segment_colors[i], stroke_width=stroke_widths[i])
+            arrow.set_points(line_points[i])
+            tip = VMobject(fill_color=segment_colors[i], fill_opacity=1, stroke_width=0)
+            tip.set_points(tip_points[i])
+            arrows.add(arrow.add(tip))
+
         # Set fixed points A and B for the paths
-        point_A = np.array([-4, PATH_Y_POSITION, 0])
-        point_B = np.array([4, PATH_Y_POSITION, 0])
-        
+        point_A = np.array([-4, self.PATH_Y_POSITION, 0])
+        point_B = np.array([4, self.PATH_Y_POSITION, 0])
+
         # Create dots for points A and B
         dot_A = Dot(point_A, color=WHITE)
         dot_B = Dot(point_B, color=WHITE)
-        
+
         # Create labels for points A and B
         label_A = Text("A", font_size=24).next_to(dot_A, DOWN)
         label_B = Text("B", font_size=24).next_to(dot_B, DOWN)
-        
+
         # Add fixed elements to the scene
         self.add(dot_A, dot_B, label_A, label_B)
-        
+
         # Create paths from A to B that change shape
         # We'll create fewer paths to avoid overcrowding
-        step = PATH_SAMPLING  # Create a path for every N arrows
+        step = self.PATH_SAMPLING  # Create a path for every N arrows
+        path_indices = np.arange(0, N - 1, step)
+
+        # Start with wide V, transition to straight line, end with upside-down V
+        # Vertical displacement of the middle control point ranges from PATH_HEIGHT_MAX/2 to -PATH_HEIGHT_MAX/2
+        middle_y_offsets = self.PATH_HEIGHT_MAX * (path_indices / (N - 1) - 0.5)
+
         paths = VGroup()
-        
-        for i in range(0, N - 1, step):
-            # Calculate progress (0 to 1) for determining path shape
-            progress = i / (N - 1)
-            
-            # Calculate vertical displacement for the middle control point
-            # Start with wide V, transition to straight line, end with upside-down V
-            middle_y_offset = PATH_HEIGHT_MAX * (progress - 0.5)  # Ranges from PATH_HEIGHT_MAX/2 to -PATH_HEIGHT_MAX/2
-            
-            # Middle control point
-            control_point = np.array([0, PATH_Y_POSITION + middle_y_offset, 0])
-            
+        for i, middle_y_offset in zip(path_indices, middle_y_offsets):
             # Create a V-shaped path (two straight lines joined at the control point)
+            control_point = np.array([0, self.PATH_Y_POSITION + middle_y_offset, 0])
             path = VMobject()
             path.set_points_as_corners([point_A, control_point, point_B])
-            
+
             # Use the same color as the corresponding arrow
             path.set_color(segment_colors[i])
-            
+
             paths.add(path)
-        
+
         # Animate them appearing one by one in sequence
         self.play(
-            LaggedStart(
-                *[Create(arrow) for arrow in arrows],
+            LaggedCreate(
+                arrows,
                 lag_ratio=0.9, ## DO NOT CHANGE THIS. I WANT THIS LAG RATIO
                 run_time=6
             ),
-            LaggedStart(
-                *[Create(path) for path in paths],
+            LaggedCreate(
+                paths,
                 lag_ratio=0.9 * step,  # Adjust to match arrow timing
                 run_time=6
             )
         )
-        
+
         # Pause to see the final spiral
         self.wait(1)
 
@@ -0,0 +1,192 @@
+"""
+Render CornuSpiral for every combination of parameter values, one process per render.
+
+    python sweep.py SPIRAL_SCALE=3.4,3.8,4.2 PATH_SAMPLING=3,5
+    python sweep.py --grid grid.json --preview
+    python sweep.py PATH_HEIGHT_MAX=1,1.5,2 --preview-only
+
+Parameters are the class attributes at the top of CornuSpiral in main.py; any that
+aren't given keep their default. A grid file is JSON like {"SPIRAL_SCALE": [3.4, 3.8]}.
+
+Every video is stored in sweep_renders/ under a hash of its parameters, the quality
+and the source of main.py, so a configuration that was already rendered (and whose
+scene code hasn't changed since) is reused instead of re-rendered. index.json in the
+same folder lists the parameters behind each file.
+
+--preview renders everything at low quality first, which is quick to scrub through
+while the full-quality renders are still running.
+"""
+import argparse
+import ast
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCENE_FILE = os.path.join(HERE, 'main.py')
+DEFAULT_OUTPUT_DIR = os.path.join(HERE, 'sweep_renders')
+PARAMETERS = ['SPIRAL_SCALE', 'SPIRAL_Y_POSITION', 'PATH_Y_POSITION', 'PATH_HEIGHT_MAX', 'PATH_SAMPLING']
+
+
+def parse_assignment(text):
+    """'SPIRAL_SCALE=3.4,3.8' -> ('SPIRAL_SCALE', ['3.4', '3.8'])"""
+    name, _, values = text.partition('=')
+    if not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=value1,value2,... got {text!r}")
+    return name.strip(), [v.strip() for v in values.split(',')]
+
+
+def read_defaults():
+    """PARAMETERS as set in CornuSpiral, read from the source of main.py so this process never loads manim."""
+    with open(SCENE_FILE, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    scene = next(node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == 'CornuSpiral')
+    defaults = {}
+    for node in scene.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name) \
+                and node.targets[0].id in PARAMETERS:
+            defaults[node.targets[0].id] = ast.literal_eval(node.value)
+    return {name: defaults[name] for name in PARAMETERS}
+
+
+def convert_value(name, text, default):
+    """text as the type of the default; int parameters only accept whole numbers."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise SystemExit(f"{name}: {text!r} is not a number") from None
+    if isinstance(default, int):
+        if not value.is_integer():
+            raise SystemExit(f"{name} takes whole numbers, got {text!r}")
+        return int(value)
+    return value
+
+
+def build_configurations(grid, defaults):
+    """Every combination of the grid values, with values converted to the type of the default."""
+    unknown = set(grid) - set(defaults)
+    if unknown:
+        raise SystemExit(f"Unknown parameter(s) {', '.join(sorted(unknown))}; "
+                         f"choose from {', '.join(defaults)}")
+    names = list(grid)
+    values = [[convert_value(name, v, defaults[name]) for v in grid[name]] for name in names]
+    return [{**defaults, **dict(zip(names, combination))} for combination in itertools.product(*values)]
+
+
+def scene_source_hash():
+    with open(SCENE_FILE, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def config_key(params, quality, source_hash):
+    digest = hashlib.sha256()
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    digest.update(quality.encode())
+    digest.update(source_hash.encode())
+    return digest.hexdigest()[:16]
+
+
+def render(params, quality, output_path):
+    """Runs in a worker process: render one configuration and move the video to output_path."""
+    # Imported here so the parent process never needs manim loaded
+    from manim import tempconfig
+    from main import CornuSpiral
+
+    scene_class = type('CornuSpiral', (CornuSpiral,), params)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as media_dir:
+        with tempconfig({"quality": quality, "media_dir": media_dir, "disable_caching": True,
+                         "progress_bar": "none", "verbosity": "WARNING"}):
+            scene = scene_class()
+            scene.render()
+            movie = scene.renderer.file_writer.movie_file_path
+        # Write under a temporary name first so an interrupted move never looks like a cached render
+        shutil.move(movie, output_path + '.partial')
+        os.replace(output_path + '.partial', output_path)
+    return time.perf_counter() - start
+
+
+def load_index(output_dir):
+    path = os.path.join(output_dir, 'index.json')
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def save_index(output_dir, index):
+    path = os.path.join(output_dir, 'index.json')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def run_pass(configurations, quality, output_dir, workers, source_hash):
+    """Render every configuration not already in the cache; returns the video path per configuration."""
+    index = load_index(output_dir)
+    paths = []
+    pending = {}
+    for params in configurations:
+        key = config_key(params, quality, source_hash)
+        path = os.path.join(output_dir, f'{key}_{quality}.mp4')
+        paths.append(path)
+        if os.path.exists(path):
+            print(f"[cached] {path}")
+        else:
+            pending[key] = (params, path)
+
+    if pending:
+        print(f"Rendering {len(pending)} of {len(configurations)} configurations at {quality} "
+              f"with {workers} processes")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(render, params, quality, path): key
+                       for key, (params, path) in pending.items()}
+            for future in as_completed(futures):
+                key = futures[future]
+                params, path = pending[key]
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    print(f"[failed] {params}: {e}")
+                    continue
+                index[os.path.basename(path)] = {'params': params, 'quality': quality,
+                                                 'scene_hash': source_hash, 'render_seconds': round(seconds, 2)}
+                save_index(output_dir, index)
+                print(f"[{seconds:.1f}s] {path}")
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render CornuSpiral over a grid of parameter values")
+    parser.add_argument('assignments', nargs='*', type=parse_assignment,
+                        help="NAME=value1,value2,... for any of " + ', '.join(PARAMETERS))
+    parser.add_argument('--grid', help="JSON file mapping parameter names to lists of values")
+    parser.add_argument('--quality', default='high_quality', help="manim quality preset for the full render")
+    parser.add_argument('--preview', action='store_true', help="render a low quality pass of everything first")
+    parser.add_argument('--preview-only', action='store_true', help="only render the low quality pass")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="parallel renders (default: all cores)")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args()
+
+    defaults = read_defaults()
+
+    grid = {}
+    if args.grid:
+        with open(args.grid) as f:
+            grid.update({name: [str(v) for v in values] for name, values in json.load(f).items()})
+    grid.update(dict(args.assignments))
+    configurations = build_configurations(grid, defaults)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    source_hash = scene_source_hash()
+    start = time.perf_counter()
+    if args.preview or args.preview_only:
+        run_pass(configurations, 'low_quality', args.output_dir, args.workers, source_hash)
+    if not args.preview_only:
+        run_pass(configurations, args.quality, args.output_dir, args.workers, source_hash)
+    print(f"{len(configurations)} configurations done in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,227 @@
+"""
+Local stand-in for the parts of the YouTube Data API v3 our scripts use.
+
+Serves a synthetic channel from memory, sends ETags and answers matching
+If-None-Match headers with 304, so youtube_cache.py can be exercised without
+spending real quota. Point the scraper at it with
+
+    python mock_youtube_api.py --port 8090 &
+    YOUTUBE_API_ENDPOINT=http://127.0.0.1:8090/ python youtube_scraper.py
+
+--latency delays every response, like the round trip to Google would, and
+--quota-limit makes the server charge quota units per call (304s included,
+as the real API does) and answer 403 quotaExceeded once they run out.
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from youtube_cache import QUOTA_COSTS
+
+CHANNEL_ID = 'UCHnyfMqiRRG1u-2MsSQLbXA'
+CHANNEL_TITLE = 'Mock Channel'
+# The channel's uploads playlist: its id with UC replaced by UU
+UPLOADS_PLAYLIST_ID = 'UU' + CHANNEL_ID[2:]
+
+
+def make_videos(count):
+    """Newest-first list of fake videos; every fifth one is a short."""
+    videos = []
+    for i in range(count):
+        seconds = 45 if i % 5 == 4 else 600 + i
+        videos.append({
+            'id': f"vid{i:08d}",
+            'title': f"Mock video {i} &amp; friends",
+            'publishedAt': f"{2024 - i // 365}-{1 + (i // 28) % 12:02d}-{1 + i % 28:02d}T12:00:00Z",
+            'duration': f"PT{seconds // 60}M{seconds % 60}S",
+        })
+    return videos
+
+
+class MockYouTubeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, video_count=500, latency=0.0, quota_limit=None):
+        super().__init__(address, MockYouTubeHandler)
+        self.videos = make_videos(video_count)
+        self.videos_by_id = {v['id']: v for v in self.videos}
+        self.latency = latency
+        self.quota_limit = quota_limit
+        self.lock = threading.Lock()
+        self.reset_counters()
+
+    def reset_counters(self):
+        with self.lock:
+            self.requests = Counter()
+            self.not_modified = Counter()
+            self.quota_used = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+
+class MockYouTubeHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        endpoint = parsed.path.rstrip('/').rsplit('/', 1)[-1]
+
+        handlers = {
+            'search': self.search,
+            'playlistItems': self.playlist_items,
+            'videos': self.videos,
+        }
+        if endpoint not in handlers:
+            self.send_json(404, {'error': {'code': 404, 'message': f"Unknown endpoint {endpoint}"}})
+            return
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        server = self.server
+        cost = QUOTA_COSTS.get(f"{endpoint}.list", 1)
+        with server.lock:
+            over_quota = server.quota_limit is not None and server.quota_used + cost > server.quota_limit
+            if not over_quota:
+                server.requests[endpoint] += 1
+                server.quota_used += cost
+        if over_quota:
+            self.send_json(403, {'error': {
+                'code': 403,
+                'message': "The request cannot be completed because you have exceeded your quota.",
+                'errors': [{'reason': 'quotaExceeded', 'domain': 'youtube.quota'}],
+            }})
+            return
+
+        body = handlers[endpoint](params)
+        if body is None:
+            self.send_json(404, {'error': {'code': 404, 'message': "Playlist not found",
+                                           'errors': [{'reason': 'playlistNotFound'}]}})
+            return
+
+        # Same content -> same ETag, so unchanged pages can be answered with 304
+        etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+        body['etag'] = etag.strip('"')
+        if self.headers.get('If-None-Match') == etag:
+            with self.server.lock:
+                self.server.not_modified[endpoint] += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_json(200, body, etag)
+
+    def send_json(self, status, body, etag=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(payload)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def search(self, params):
+        max_results = int(params.get('maxResults', 5))
+        start = int(params.get('pageToken') or 0)
+        page = self.server.videos[start:start + max_results]
+        body = {
+            'kind': 'youtube#searchListResponse',
+            'items': [{
+                'kind': 'youtube#searchResult',
+                'id': {'kind': 'youtube#video', 'videoId': v['id']},
+                'snippet': {
+                    'publishedAt': v['publishedAt'],
+                    'channelId': CHANNEL_ID,
+                    'title': v['title'],
+                    'channelTitle': CHANNEL_TITLE,
+                },
+            } for v in page],
+            'pageInfo': {'totalResults': len(self.server.videos), 'resultsPerPage': max_results},
+        }
+        if start + max_results < len(self.server.videos):
+            body['nextPageToken'] = str(start + max_results)
+        return body
+
+    def playlist_items(self, params):
+        if params.get('playlistId') != UPLOADS_PLAYLIST_ID:
+            return None
+        max_results = int(params.get('maxResults', 5))
+        start = int(params.get('pageToken') or 0)
+        page = self.server.videos[start:start + max_results]
+        body = {
+            'kind': 'youtube#playlistItemListResponse',
+            'items': [{
+                'kind': 'youtube#playlistItem',
+                'id': f"item{v['id']}",
+                'snippet': {
+                    'publishedAt': v['publishedAt'],
+                    'channelId': CHANNEL_ID,
+                    'title': v['title'],
+                    'channelTitle': CHANNEL_TITLE,
+                    'playlistId': UPLOADS_PLAYLIST_ID,
+                    'position': start + i,
+                    'resourceId': {'kind': 'youtube#video', 'videoId': v['id']},
+                },
+                'contentDetails': {'videoId': v['id'], 'videoPublishedAt': v['publishedAt']},
+            } for i, v in enumerate(page)],
+            'pageInfo': {'totalResults': len(self.server.videos), 'resultsPerPage': max_results},
+        }
+        if start + max_results < len(self.server.videos):
+            body['nextPageToken'] = str(start + max_results)
+        return body
+
+    def videos(self, params):
+        ids = [i for i in params.get('id', '').split(',') if i]
+        items = []
+        for video_id in ids:
+            v = self.server.videos_by_id.get(video_id)
+            if v is None:
+                continue
+            items.append({
+                'kind': 'youtube#video',
+                'id': video_id,
+                'snippet': {
+                    'publishedAt': v['publishedAt'],
+                    'channelId': CHANNEL_ID,
+                    'title': v['title'],
+                    'channelTitle': CHANNEL_TITLE,
+                },
+                'contentDetails': {'duration': v['duration']},
+            })
+        return {'kind': 'youtube#videoListResponse', 'items': items}
+
+
+def start_server(port=0, video_count=500, latency=0.0, quota_limit=None):
+    """Start the mock API on a background thread and return the server."""
+    server = MockYouTubeServer(('127.0.0.1', port), video_count=video_count, latency=latency,
+                               quota_limit=quota_limit)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock of the YouTube Data API")
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--videos', type=int, default=500, help="number of videos on the mock channel")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--quota-limit', type=int, help="quota units to allow before answering quotaExceeded")
+    args = parser.parse_args()
+
+    server = MockYouTubeServer(('127.0.0.1', args.port), video_count=args.videos, latency=args.latency,
+                               quota_limit=args.quota_limit)
+    print(f"Mock YouTube API listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
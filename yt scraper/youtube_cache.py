@@ -0,0 +1,199 @@
+"""
+Caching wrapper around the googleapiclient YouTube client.
+
+Every response is stored together with its ETag. Later identical calls send
+If-None-Match, and a 304 from the API is answered from the cache instead of
+downloading the body again. Quota units are counted per method for the current
+run and added to a running total for the current quota day.
+
+    youtube = CachedYouTube(build('youtube', 'v3', developerKey=API_KEY))
+    response = youtube.videos().list(part='snippet', id=video_id).execute()
+    print(youtube.quota_summary())
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from googleapiclient.errors import HttpError
+
+# Quota cost per call, see https://developers.google.com/youtube/v3/determine_quota_cost
+QUOTA_COSTS = {
+    'search.list': 100,
+    'videos.list': 1,
+    'playlistItems.list': 1,
+    'playlists.list': 1,
+    'channels.list': 1,
+}
+DEFAULT_DAILY_LIMIT = 10000
+
+# The YouTube quota resets at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_FILE = os.path.join(HERE, '.youtube_cache.json')
+DEFAULT_QUOTA_FILE = os.path.join(HERE, '.youtube_quota.json')
+
+
+def _load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_json(path, data):
+    # Write to a temp file first so a crash never leaves half a cache behind
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class CachedYouTube:
+    """Drop-in replacement for the object returned by build('youtube', 'v3')."""
+
+    def __init__(self, client, cache_file=DEFAULT_CACHE_FILE, quota_file=DEFAULT_QUOTA_FILE,
+                 daily_limit=DEFAULT_DAILY_LIMIT):
+        self._client = client
+        self.cache_file = cache_file
+        self.quota_file = quota_file
+        self.daily_limit = daily_limit
+
+        self._lock = threading.Lock()
+        self._cache = _load_json(cache_file) if cache_file else {}
+        self._dirty = False
+
+        # Per-run accounting
+        self.calls = Counter()
+        self.quota_used = Counter()
+        self.not_modified = Counter()
+        # Units already added to the quota file by an earlier flush()
+        self._flushed_units = 0
+
+        atexit.register(self.flush)
+
+    def __getattr__(self, resource_name):
+        resource_factory = getattr(self._client, resource_name)
+
+        def resource(*args, **kwargs):
+            return _CachedResource(self, resource_name, resource_factory(*args, **kwargs))
+        return resource
+
+    # ------------------------------------------------------------------
+    # Cache and quota bookkeeping
+    # ------------------------------------------------------------------
+    @staticmethod
+    def cache_key(method_name, params):
+        payload = json.dumps([method_name, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def lookup(self, key):
+        with self._lock:
+            return self._cache.get(key)
+
+    def store(self, key, etag, body):
+        with self._lock:
+            self._cache[key] = {'etag': etag, 'body': body}
+            self._dirty = True
+
+    def record_call(self, method_name, not_modified=False):
+        cost = QUOTA_COSTS.get(method_name, 1)
+        with self._lock:
+            self.calls[method_name] += 1
+            self.quota_used[method_name] += cost
+            if not_modified:
+                self.not_modified[method_name] += 1
+            self._dirty = True
+
+    @staticmethod
+    def quota_day():
+        return datetime.now(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+    def daily_total(self):
+        """Quota units spent today, including this run."""
+        with self._lock:
+            stored = _load_json(self.quota_file) if self.quota_file else {}
+            return stored.get(self.quota_day(), 0) + sum(self.quota_used.values()) - self._flushed_units
+
+    def flush(self):
+        """Write the response cache and today's quota total to disk."""
+        with self._lock:
+            if not self._dirty:
+                return
+            if self.cache_file:
+                _save_json(self.cache_file, self._cache)
+            if self.quota_file:
+                stored = _load_json(self.quota_file)
+                day = self.quota_day()
+                run_units = sum(self.quota_used.values())
+                stored[day] = stored.get(day, 0) + run_units - self._flushed_units
+                self._flushed_units = run_units
+                _save_json(self.quota_file, stored)
+            self._dirty = False
+
+    def quota_summary(self):
+        lines = ["Quota usage this run:"]
+        for method_name in sorted(self.calls):
+            lines.append(
+                f"  {method_name}: {self.calls[method_name]} calls, "
+                f"{self.quota_used[method_name]} units, "
+                f"{self.not_modified[method_name]} not modified"
+            )
+        lines.append(f"  total: {sum(self.quota_used.values())} units")
+        total = self.daily_total()
+        lines.append(f"Today ({self.quota_day()} PT): {total} / {self.daily_limit} units "
+                     f"({100 * total / self.daily_limit:.1f}%)")
+        return "\n".join(lines)
+
+
+class _CachedResource:
+    def __init__(self, owner, resource_name, resource):
+        self._owner = owner
+        self._resource_name = resource_name
+        self._resource = resource
+
+    def __getattr__(self, method_name):
+        method = getattr(self._resource, method_name)
+        full_name = f"{self._resource_name}.{method_name}"
+
+        def call(**kwargs):
+            return _CachedRequest(self._owner, full_name, kwargs, method(**kwargs))
+        return call
+
+
+class _CachedRequest:
+    def __init__(self, owner, method_name, params, request):
+        self._owner = owner
+        self.method_name = method_name
+        self.key = owner.cache_key(method_name, params)
+        self.request = request
+
+    def execute(self, http=None, num_retries=0):
+        owner = self._owner
+        cached = owner.lookup(self.key)
+        if cached and cached.get('etag'):
+            self.request.headers['If-None-Match'] = cached['etag']
+
+        # The ETag header is only visible to response callbacks, not in the return value
+        response_headers = {}
+        self.request.add_response_callback(response_headers.update)
+
+        try:
+            body = self.request.execute(http=http, num_retries=num_retries)
+        except HttpError as e:
+            if e.resp.status == 304 and cached:
+                owner.record_call(self.method_name, not_modified=True)
+                return cached['body']
+            raise
+
+        owner.record_call(self.method_name)
+        etag = response_headers.get('etag') or body.get('etag')
+        if etag:
+            owner.store(self.key, etag, body)
+        return body
@@ -1,84 +1,164 @@
 from googleapiclient.discovery import build
-import pandas as pd
+from googleapiclient.http import build_http
+import argparse
+import csv
 import os
+import queue
+import threading
 from dotenv import load_dotenv
 import html  # Add this import at the top
 import re
+from youtube_cache import CachedYouTube
 
 load_dotenv()
 
 # Get API key from environment variable
 API_KEY = os.getenv('YOUTUBE_API_KEY')
+# Optional override, e.g. http://127.0.0.1:8090/ for mock_youtube_api.py
+API_ENDPOINT = os.getenv('YOUTUBE_API_ENDPOINT')
 
-# Create YouTube API client
-youtube = build('youtube', 'v3', developerKey=API_KEY)
+# Create YouTube API client. Responses are cached with their ETags and quota is tracked
+client_options = {'api_endpoint': API_ENDPOINT} if API_ENDPOINT else None
+youtube = CachedYouTube(build('youtube', 'v3', developerKey=API_KEY, client_options=client_options))
 
-def get_channel_videos():
+def list_videos_page(source, channel_id, page_token):
+    """Request for one page (up to 50) of the channel's videos, newest first."""
+    if source == 'uploads':
+        # Every channel's uploads are also a playlist, its ID with UC replaced by UU.
+        # A page of it costs 1 quota unit, a search page 100
+        return youtube.playlistItems().list(
+            part='snippet',
+            playlistId='UU' + channel_id[2:],
+            maxResults=50,
+            pageToken=page_token
+        )
+    return youtube.search().list(
+        part='snippet',
+        channelId=channel_id,
+        maxResults=50,
+        order='date',
+        type='video',
+        pageToken=page_token
+    )
+
+def prefetch_pages(source, channel_id, pages, stop):
+    """Producer thread: put every page of the video list on the pages queue, then None.
+
+    An exception is put on the queue instead, for the consumer to raise.
+    """
+    # httplib2 connections aren't thread-safe, so this thread gets its own
+    http = build_http()
+
+    def put(item):
+        # Give up once the consumer has stopped, rather than blocking on a full queue forever
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    next_page_token = None
+    try:
+        while True:
+            response = list_videos_page(source, channel_id, next_page_token).execute(http=http)
+            if not put(response):
+                return
+            # Check if there are more pages
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token:
+                break
+    except Exception as e:
+        put(e)
+        return
+    put(None)
+
+def duration_seconds(duration):
+    """ISO 8601 duration to seconds (PT1M30S -> 90)"""
+    duration_sec = 0
+    minutes = re.search(r'(\d+)M', duration)
+    seconds = re.search(r'(\d+)S', duration)
+    
+    if minutes:
+        duration_sec += int(minutes.group(1)) * 60
+    if seconds:
+        duration_sec += int(seconds.group(1))
+    return duration_sec
+
+def get_channel_videos(source='search', output='veritasium_videos.csv', prefetch=2):
+    """Save the channel's videos, without shorts, to output.
+
+    Pages of the video list are fetched by a producer thread up to `prefetch`
+    pages ahead, while this thread looks up the durations of the page before, so
+    each page costs about the slower of the two calls instead of both. Rows are
+    written to OUTPUT.partial as each page is done and the file is renamed at the end.
+    """
     # Veritasium's channel ID
     channel_id = 'UCHnyfMqiRRG1u-2MsSQLbXA'
     
-    videos = []
-    next_page_token = None
+    pages = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    producer = threading.Thread(target=prefetch_pages, args=(source, channel_id, pages, stop), daemon=True)
+    producer.start()
     
-    while True:
-        # Get channel videos
-        request = youtube.search().list(
-            part='snippet',
-            channelId=channel_id,
-            maxResults=50,
-            order='date',
-            type='video',
-            pageToken=next_page_token
-        )
-        response = request.execute()
-        
-        # Get video durations in batch
-        video_ids = [item['id']['videoId'] for item in response['items']]
-        videos_details = youtube.videos().list(
-            part='contentDetails',
-            id=','.join(video_ids)
-        ).execute()
-        
-        # Create duration lookup dictionary
-        duration_lookup = {
-            item['id']: item['contentDetails']['duration'] 
-            for item in videos_details['items']
-        }
-        
-        # Extract video information, excluding shorts
-        for item in response['items']:
-            video_id = item['id']['videoId']
-            duration = duration_lookup.get(video_id, '')
-            
-            # Convert duration to seconds (PT1M30S -> 90)
-            duration_sec = 0
-            minutes = re.search(r'(\d+)M', duration)
-            seconds = re.search(r'(\d+)S', duration)
+    count = 0
+    partial_output = f"{output}.partial"
+    try:
+        with open(partial_output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['title', 'video_id'], lineterminator='\n')
+            writer.writeheader()
             
-            if minutes:
-                duration_sec += int(minutes.group(1)) * 60
-            if seconds:
-                duration_sec += int(seconds.group(1))
-            
-            # Skip if duration is less than 61 seconds (shorts are usually 60 sec or less)
-            if duration_sec <= 60:
-                continue
+            while True:
+                response = pages.get()
+                if response is None:
+                    break
+                if isinstance(response, Exception):
+                    raise response
+                
+                # Search results and playlist items keep the video ID in different places
+                if source == 'uploads':
+                    video_ids = [item['snippet']['resourceId']['videoId'] for item in response['items']]
+                else:
+                    video_ids = [item['id']['videoId'] for item in response['items']]
                 
-            video = {
-                'title': html.unescape(item['snippet']['title']),
-                'video_id': video_id
-            }
-            videos.append(video)
-        
-        # Check if there are more pages
-        next_page_token = response.get('nextPageToken')
-        if not next_page_token:
-            break
+                # Get video durations in batch
+                videos_details = youtube.videos().list(
+                    part='contentDetails',
+                    id=','.join(video_ids)
+                ).execute()
+                
+                # Create duration lookup dictionary
+                duration_lookup = {
+                    item['id']: item['contentDetails']['duration'] 
+                    for item in videos_details['items']
+                }
+                
+                # Extract video information, excluding shorts
+                for item, video_id in zip(response['items'], video_ids):
+                    # Skip if duration is less than 61 seconds (shorts are usually 60 sec or less)
+                    if duration_seconds(duration_lookup.get(video_id, '')) <= 60:
+                        continue
+                    
+                    writer.writerow({
+                        'title': html.unescape(item['snippet']['title']),
+                        'video_id': video_id
+                    })
+                    count += 1
+                f.flush()
+    finally:
+        stop.set()
     
-    # Create DataFrame and save to CSV
-    df = pd.DataFrame(videos)
-    df.to_csv('veritasium_videos.csv', index=False)
-    print(f"Saved {len(videos)} videos to veritasium_videos.csv")
+    os.replace(partial_output, output)
+    print(f"Saved {count} videos to {output}")
+
+    youtube.flush()
+    print(youtube.quota_summary())
 
 if __name__ == "__main__":
-    get_channel_videos() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Save a channel's videos (without shorts) to CSV")
+    parser.add_argument('--source', choices=['search', 'uploads'], default='search',
+                        help="page through search results (100 units per page) or the "
+                             "channel's uploads playlist (1 unit per page)")
+    args = parser.parse_args()
+    get_channel_videos(args.source)